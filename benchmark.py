@@ -0,0 +1,333 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timezone
+from math import isqrt
+from typing import Any, Callable
+
+from run import HOME, Part, PartResult, discover_parts, format_results, run_isolated, select_parts
+
+# multiples of the size of a real puzzle input
+SCALES: tuple[int, ...] = (10, 100, 1000)
+# kept out of version control (see .gitignore); pass --history to keep it somewhere else
+HISTORY_PATH: str = os.path.join(HOME, 'benchmark_history.json')
+INPUT_DIRECTORY: str = os.path.join(tempfile.gettempdir(), 'benchmark_inputs')
+# a part running this much slower than its recent history is a regression
+REGRESSION_THRESHOLD: float = 0.25
+# number of earlier runs of a part the baseline is taken from
+BASELINE_RUNS: int = 5
+# seconds any one part may take before we give up upon it
+TIMEOUT: float = 600.0
+
+# (scale, random number generator) -> the text of an input, scale times the size of a real one
+Generator = Callable[[int, random.Random], str]
+
+
+def side(base: int, scale: int) -> int:
+    """Side of a square grid holding scale times the cells of a base by base one"""
+    result: int = isqrt(base * base * scale)
+    return result
+
+def random_grid(size: int, generator: random.Random, fill: str, scatter: str, density: float) -> list[list[str]]:
+    result: list[list[str]] = [[generator.choice(scatter) if generator.random() < density else fill for c in range(size)] for r in range(size)]
+    return result
+
+def generate_location_lists(scale: int, generator: random.Random) -> str:
+    lines: list[str] = [f'{generator.randrange(10000, 100000)}   {generator.randrange(10000, 100000)}' for i in range(1000 * scale)]
+    result: str = '\n'.join(lines) + '\n'
+    return result
+
+def generate_reports(scale: int, generator: random.Random) -> str:
+    lines: list[str] = []
+    for i in range(1000 * scale):
+        level: int = generator.randrange(1, 90)
+        sign: int = generator.choice((-1, 1))
+        levels: list[int] = [level]
+        for j in range(generator.randrange(4, 8)):
+            # mostly gentle slopes, with the odd jump or reversal to keep things interesting
+            level += sign * generator.choice((1, 2, 3, 1, 2, 3, 0, 5, -2))
+            levels.append(level)
+        lines.append(' '.join(str(v) for v in levels))
+    result: str = '\n'.join(lines) + '\n'
+    return result
+
+def generate_corrupted_memory(scale: int, generator: random.Random) -> str:
+    fragments: list[str] = ['mul(', ')', ',', 'do()', "don't()", 'what()', 'from()', '[', ']', ' ', '%', '<', 'select()']
+    pieces: list[str] = []
+    for i in range(700 * scale):
+        pieces.append(generator.choice(fragments))
+        pieces.append(f'mul({generator.randrange(1, 1000)},{generator.randrange(1, 1000)})')
+        if generator.random() < 0.02:
+            pieces.append('\n')
+    result: str = ''.join(pieces) + '\n'
+    return result
+
+def generate_word_search(scale: int, generator: random.Random) -> str:
+    size: int = side(base=140, scale=scale)
+    # weighted towards the letters of XMAS so that there is plenty to find
+    rows: list[str] = [''.join(generator.choice('XMASXMASS') for c in range(size)) for r in range(size)]
+    result: str = '\n'.join(rows) + '\n'
+    return result
+
+def generate_print_queue(scale: int, generator: random.Random) -> str:
+    # a total order over the pages; every pair of pages close enough together gets a rule
+    pages: list[int] = generator.sample(range(10, 100), 49)
+    rules: list[str] = []
+    for i, before in enumerate(pages):
+        for after in pages[i + 1:]:
+            rules.append(f'{before}|{after}')
+    generator.shuffle(rules)
+    updates: list[str] = []
+    for i in range(200 * scale):
+        update: list[int] = generator.sample(pages, generator.randrange(2, 12) * 2 + 1)
+        if generator.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(','.join(str(p) for p in update))
+    result: str = '\n'.join(rules) + '\n\n' + '\n'.join(updates) + '\n'
+    return result
+
+def generate_guard_map(scale: int, generator: random.Random) -> str:
+    size: int = side(base=130, scale=scale)
+    rows: list[list[str]] = random_grid(size=size, generator=generator, fill='.', scatter='#', density=0.012)
+    rows[size // 2 + generator.randrange(size // 4)][size // 2 + generator.randrange(size // 4)] = '^'
+    result: str = '\n'.join(''.join(row) for row in rows) + '\n'
+    return result
+
+def generate_equations(scale: int, generator: random.Random) -> str:
+    lines: list[str] = []
+    for i in range(850 * scale):
+        operands: list[int] = [generator.randrange(1, 100) for j in range(generator.randrange(2, 10))]
+        # two thirds of them can be balanced, the rest are probably out of luck
+        target: int = operands[0]
+        for operand in operands[1:]:
+            choices: list[int] = [target + operand, target * operand, int(f'{target}{operand}')]
+            # keep the targets within 64 bits, as the real ones are
+            target = generator.choice([c for c in choices if c < 10 ** 15] or choices[:1])
+        if generator.random() < 0.33:
+            target += generator.randrange(1, 100)
+        lines.append(f'{target}: ' + ' '.join(str(o) for o in operands))
+    result: str = '\n'.join(lines) + '\n'
+    return result
+
+def generate_antennae(scale: int, generator: random.Random) -> str:
+    size: int = side(base=50, scale=scale)
+    frequencies: str = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    rows: list[list[str]] = random_grid(size=size, generator=generator, fill='.', scatter=frequencies, density=0.08)
+    result: str = '\n'.join(''.join(row) for row in rows) + '\n'
+    return result
+
+def generate_disk_map(scale: int, generator: random.Random) -> str:
+    # no trailing newline; extract_disk_map() reads every character of the line as a digit
+    result: str = ''.join(str(generator.randrange(1 if i % 2 == 0 else 0, 10)) for i in range(19999 * scale))
+    return result
+
+def generate_topographic_map(scale: int, generator: random.Random) -> str:
+    size: int = side(base=50, scale=scale)
+    # gentle slopes rising away from scattered trailheads, so that trails actually go somewhere
+    rows: list[str] = []
+    for r in range(size):
+        rows.append(''.join(str((abs(r % 19 - 9) + abs(c % 17 - 8) + (generator.random() < 0.1)) % 10) for c in range(size)))
+    result: str = '\n'.join(rows) + '\n'
+    return result
+
+def generate_stones(scale: int, generator: random.Random) -> str:
+    result: str = ' '.join(str(generator.randrange(0, 10000000)) for i in range(8 * scale)) + '\n'
+    return result
+
+def generate_garden(scale: int, generator: random.Random) -> str:
+    size: int = side(base=140, scale=scale)
+    # blocks of a single plant, roughed up around the edges
+    block: int = 7
+    plants: dict[tuple[int, int], str] = {}
+    rows: list[str] = []
+    for r in range(size):
+        row: list[str] = []
+        for c in range(size):
+            if generator.random() < 0.15:
+                r_block, c_block = (r + generator.randrange(-2, 3)) // block, (c + generator.randrange(-2, 3)) // block
+            else:
+                r_block, c_block = r // block, c // block
+            if (r_block, c_block) not in plants:
+                plants[(r_block, c_block)] = generator.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+            row.append(plants[(r_block, c_block)])
+        rows.append(''.join(row))
+    result: str = '\n'.join(rows) + '\n'
+    return result
+
+def generate_claw_machines(scale: int, generator: random.Random) -> str:
+    machines: list[str] = []
+    for i in range(320 * scale):
+        ax, ay, bx, by = (generator.randrange(10, 100) for j in range(4))
+        presses_a, presses_b = generator.randrange(1, 100), generator.randrange(1, 100)
+        x, y = ax * presses_a + bx * presses_b, ay * presses_a + by * presses_b
+        if generator.random() < 0.5:
+            x += generator.randrange(1, 50)
+        machines.append(f'Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={x}, Y={y}')
+    result: str = '\n\n'.join(machines) + '\n'
+    return result
+
+def generate_robots(scale: int, generator: random.Random) -> str:
+    lines: list[str] = [f'p={generator.randrange(101)},{generator.randrange(103)} v={generator.randrange(-100, 101)},{generator.randrange(-100, 101)}' for i in range(500 * scale)]
+    result: str = '\n'.join(lines) + '\n'
+    return result
+
+def generate_warehouse(scale: int, generator: random.Random) -> str:
+    size: int = side(base=50, scale=scale)
+    rows: list[list[str]] = random_grid(size=size, generator=generator, fill='.', scatter='O#OO', density=0.3)
+    for i in range(size):
+        rows[0][i] = rows[-1][i] = rows[i][0] = rows[i][-1] = '#'
+    rows[size // 2][size // 2] = '@'
+    moves: str = ''.join(generator.choice('<>^v') for i in range(20000 * scale))
+    result: str = '\n'.join(''.join(row) for row in rows) + '\n\n' + '\n'.join(moves[i:i + 1000] for i in range(0, len(moves), 1000)) + '\n'
+    return result
+
+def generate_network(scale: int, generator: random.Random) -> str:
+    letters: str = 'abcdefghijklmnopqrstuvwxyz'
+    names: list[str] = [a + b for a in letters for b in letters]
+    # names are two letters, so beyond the real input's 520 or so computers there is only room for more connections
+    computers: list[str] = generator.sample(names, 520) if scale <= 1 else names
+    edges: set[tuple[str, str]] = set()
+    while len(edges) < min(3380 * scale, len(computers) * (len(computers) - 1) // 2):
+        alpha, beta = generator.sample(computers, 2)
+        if (beta, alpha) not in edges:
+            edges.add((alpha, beta))
+    result: str = '\n'.join(f'{a}-{b}' for a, b in edges) + '\n'
+    return result
+
+
+# generators by the prefix of the day modules they feed (day_one covers both day_one_part_one and day_one_part_two)
+GENERATORS: dict[str, Generator] = {
+    'day_one': generate_location_lists,
+    'day_two': generate_reports,
+    'day_three': generate_corrupted_memory,
+    'day_four': generate_word_search,
+    'day_five': generate_print_queue,
+    'day_six': generate_guard_map,
+    'day_seven': generate_equations,
+    'day_eight': generate_antennae,
+    'day_nine': generate_disk_map,
+    'day_ten': generate_topographic_map,
+    'day_eleven': generate_stones,
+    'day_twelve': generate_garden,
+    'day_thirteen': generate_claw_machines,
+    'day_fourteen': generate_robots,
+    'day_fifteen': generate_warehouse,
+    'day_sixteen': generate_robots,
+    'day_twenty_three': generate_network,
+}
+
+
+def generated_input(module: str, scale: int, directory: str = INPUT_DIRECTORY) -> str|None:
+    """Path of the generated input for a day module at a scale, generating it the first time round
+
+    The generator is seeded from the module and scale, so the same input comes out every time (and on every machine).
+    """
+    prefix: str = module.split('_part_')[0]
+    generator: Generator|None = GENERATORS.get(prefix)
+    if generator is None:
+        return None
+    path: str = os.path.join(directory, f'{prefix}_x{scale}.txt')
+    if not os.path.isfile(path):
+        os.makedirs(directory, exist_ok=True)
+        text: str = generator(scale, random.Random(f'{prefix}:{scale}'))
+        # write then rename, so that an interrupted run never leaves half an input behind
+        with open(path + '.partial', 'w') as file:
+            file.write(text)
+        os.replace(path + '.partial', path)
+    return path
+
+def load_history(path: str = HISTORY_PATH) -> list[dict[str, Any]]:
+    if not os.path.isfile(path):
+        return []
+    with open(path, 'r') as file:
+        result: list[dict[str, Any]] = json.load(file)
+    return result
+
+def save_history(history: list[dict[str, Any]], path: str = HISTORY_PATH) -> None:
+    with open(path + '.partial', 'w') as file:
+        json.dump(history, file, indent=1)
+    os.replace(path + '.partial', path)
+
+def baseline(history: list[dict[str, Any]], module: str, part: str, scale: int, runs: int = BASELINE_RUNS) -> float|None:
+    """Median wall time of the last few successful runs of a part at a scale, or None if it has never run"""
+    times: list[float] = [r['wall'] for entry in history for r in entry['results']
+                          if r['module'] == module and r['part'] == part and r['scale'] == scale and r['error'] is None]
+    if not times:
+        return None
+    result: float = statistics.median(times[-runs:])
+    return result
+
+def find_regressions(history: list[dict[str, Any]], results: list[dict[str, Any]], threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """Descriptions of every result that is more than threshold slower than its baseline (or has started failing)"""
+    regressions: list[str] = []
+    for r in results:
+        previous: float|None = baseline(history=history, module=r['module'], part=r['part'], scale=r['scale'])
+        if previous is None:
+            continue
+        if r['error'] is not None:
+            regressions.append(f"{r['module']} part {r['part']} x{r['scale']}: now fails ({r['error']})")
+        elif r['wall'] > previous * (1.0 + threshold):
+            regressions.append(f"{r['module']} part {r['part']} x{r['scale']}: {r['wall']:.3f}s against a baseline of {previous:.3f}s "
+                               f"({r['wall'] / previous - 1.0:+.0%})")
+    return regressions
+
+def benchmark_part(part: Part, scale: int, timeout: float = TIMEOUT) -> dict[str, Any]|None:
+    path: str|None = generated_input(module=part.module, scale=scale)
+    if path is None:
+        return None
+    outcome: PartResult = run_isolated(part=part, selection=path, timeout=timeout)
+    result: dict[str, Any] = {'module': part.module, 'part': part.name, 'scale': scale, 'wall': outcome.wall, 'cpu': outcome.cpu,
+                              'peak_rss': outcome.peak_rss, 'answer': repr(outcome.answer), 'error': outcome.error}
+    return result
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Time the day modules against generated inputs many times the size of the real ones')
+    parser.add_argument('days', nargs='*', help='days to benchmark (day_seven, seven or 7); all of them when omitted')
+    parser.add_argument('--part', action='append', help='only benchmark this part (may be repeated)')
+    parser.add_argument('--scale', action='append', type=int, help=f'multiple of the real input size (may be repeated; default {SCALES})')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='fractional slow down that counts as a regression')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='seconds any one part may take')
+    parser.add_argument('--history', default=HISTORY_PATH, help='JSON file the results are appended to')
+    parser.add_argument('--no-record', action='store_true', help='compare against the history without adding to it')
+    parser.add_argument('--generate', action='store_true', help='only generate the inputs (and say where they are)')
+    return parser
+
+def main(argv: list[str]) -> int:
+    arguments = build_parser().parse_args(argv[1:])
+    parts: list[Part] = select_parts(parts=discover_parts(), days=arguments.days, part_names=arguments.part or [])
+    scales: list[int] = arguments.scale or list(SCALES)
+    if arguments.generate:
+        for prefix in sorted({p.module.split('_part_')[0] for p in parts}):
+            for scale in scales:
+                print(generated_input(module=prefix, scale=scale))
+        return 0
+
+    results: list[dict[str, Any]] = []
+    for scale in scales:
+        for part in parts:
+            result: dict[str, Any]|None = benchmark_part(part=part, scale=scale, timeout=arguments.timeout)
+            if result is not None:
+                results.append(result)
+    rows: list[PartResult] = [PartResult(module=r['module'], part=r['part'], input=f"x{r['scale']}", answer=r['answer'], wall=r['wall'],
+                                         cpu=r['cpu'], peak_rss=r['peak_rss'], error=r['error']) for r in results]
+    print(format_results(results=rows))
+
+    history: list[dict[str, Any]] = load_history(path=arguments.history)
+    regressions: list[str] = find_regressions(history=history, results=results, threshold=arguments.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    if not arguments.no_record:
+        history.append({'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'python': platform.python_version(),
+                        'machine': platform.node(), 'results': results})
+        save_history(history=history, path=arguments.history)
+    result: int = 1 if regressions else 0
+    return result
+
+if __name__ == '__main__':
+    exit_code: int = main(sys.argv)
+    sys.exit(exit_code)
@@ -0,0 +1,57 @@
+import random
+import re
+import sys
+from math import floor
+from time import perf_counter
+
+from common import parse_int, parse_ints, INTEGER_PATTERN_NO_WHITESPACE, FLOATING_POINT_PATTERN_NO_WHITESPACE
+
+# number of values parsed for each kind of column
+VALUE_COUNT: int = 1000000
+
+def legacy_parse_int(candidate: str) -> int|None:
+    """The regex driven path parse_int() used to take for every string; kept purely for comparison"""
+    result: int|None = None
+    refined: str = str(candidate).strip()
+    if len(refined) == 0:
+        result = 0
+    elif bool(re.match(pattern=INTEGER_PATTERN_NO_WHITESPACE, string=refined)):
+        result = int(refined)
+    elif bool(re.match(pattern=FLOATING_POINT_PATTERN_NO_WHITESPACE, string=refined)):
+        result = floor(float(refined))
+    return result
+
+def build_column(kind: str, count: int) -> list[str]:
+    generator: random.Random = random.Random(count)
+    if kind == 'positive':
+        return [str(generator.randrange(0, 1000000)) for i in range(count)]
+    if kind == 'signed':
+        return [str(generator.randrange(-1000000, 1000000)) for i in range(count)]
+    # every tenth value has a fractional part, which forces the fallback
+    return [str(generator.randrange(0, 1000)) + ('.5' if i % 10 == 0 else '') for i in range(count)]
+
+def time_parser(values: list[str], parser) -> float:
+    """Average nanoseconds per value"""
+    start: float = perf_counter()
+    parser(values)
+    elapsed: float = perf_counter() - start
+    result: float = elapsed * 1e9 / len(values)
+    return result
+
+def main(argv: list[str]) -> int:
+    count: int = int(argv[1]) if len(argv) > 1 else VALUE_COUNT
+    print(f'{"column":>10} {"legacy ns":>10} {"parse_int ns":>13} {"parse_ints ns":>14}')
+    for kind in ['positive', 'signed', 'mixed']:
+        values: list[str] = build_column(kind=kind, count=count)
+        expected: list[int] = [legacy_parse_int(v) for v in values]
+        if [parse_int(v) for v in values] != expected or list(parse_ints(values)) != expected:
+            raise Exception(f'parse_int() and parse_ints() disagree with the legacy parser on the {kind} column')
+        legacy: float = time_parser(values=values, parser=lambda vs: [legacy_parse_int(v) for v in vs])
+        single: float = time_parser(values=values, parser=lambda vs: [parse_int(v) for v in vs])
+        bulk: float = time_parser(values=values, parser=parse_ints)
+        print(f'{kind:>10} {legacy:>10.1f} {single:>13.1f} {bulk:>14.1f}')
+    return 0
+
+if __name__ == '__main__':
+    exit_code: int = main(sys.argv)
+    sys.exit(exit_code)
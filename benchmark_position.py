@@ -0,0 +1,64 @@
+import random
+import sys
+from time import perf_counter
+
+from common import Position
+
+# number of lookups timed for each grid size.
+LOOKUP_COUNT: int = 1000000
+
+def legacy_hash(row: int, column: int) -> int:
+    """The hash Position used to use; kept here purely so that we can show how badly it collides"""
+    result: int = (row << 16) + column
+    return result
+
+def build_karte(rows: int, columns: int) -> dict[Position, str]:
+    """A rows x columns grid centred upon the origin, so that half of the rows and columns are negative"""
+    result: dict[Position, str] = {}
+    for row in range(-(rows >> 1), rows - (rows >> 1)):
+        for column in range(-(columns >> 1), columns - (columns >> 1)):
+            result[Position(row, column)] = '.'
+    return result
+
+def count_distinct_hashes(karte: dict[Position, str], hasher) -> int:
+    result: int = len(set(hasher(p.row, p.column) for p in karte))
+    return result
+
+def time_lookups(karte: dict[Position, str], rows: int, columns: int, count: int) -> float:
+    """Average nanoseconds per dictionary lookup, using freshly constructed (not identical) keys
+
+    For information only: lookups in bigger dictionaries get slower as they spill out of the caches, hash or no hash,
+    so this says nothing about collisions. The distinct hash counts are what is checked.
+    """
+    generator: random.Random = random.Random(rows * columns)
+    probes: list[Position] = [Position(generator.randrange(-(rows >> 1), rows - (rows >> 1)), generator.randrange(-(columns >> 1), columns - (columns >> 1))) for i in range(count)]
+    get = karte.get
+    start: float = perf_counter()
+    for probe in probes:
+        get(probe)
+    elapsed: float = perf_counter() - start
+    result: float = elapsed * 1e9 / count
+    return result
+
+def main(argv: list[str]) -> int:
+    sizes: list[int] = [int(a) for a in argv[1:]] if len(argv) > 1 else [256, 1024, 4096]
+    print(f'{"shape":>12} {"cells":>10} {"distinct hashes":>16} {"legacy distinct":>16} {"ns/lookup":>10}')
+    for size in sizes:
+        # a square grid ... and a long thin one with the same number of cells whose columns run past 65536
+        for rows, columns in [(size, size), (max(1, size >> 6), size << 6)]:
+            karte: dict[Position, str] = build_karte(rows=rows, columns=columns)
+            distinct: int = count_distinct_hashes(karte=karte, hasher=lambda r, c: hash(Position(r, c)))
+            legacy_distinct: int = count_distinct_hashes(karte=karte, hasher=legacy_hash)
+            ns_per_lookup: float = time_lookups(karte=karte, rows=rows, columns=columns, count=LOOKUP_COUNT)
+            print(f'{f"{rows}x{columns}":>12} {len(karte):>10} {distinct:>16} {legacy_distinct:>16} {ns_per_lookup:>10.1f}')
+            if distinct != len(karte):
+                raise Exception(f'Expected {len(karte)} distinct hashes for a {rows}x{columns} grid but got {distinct}')
+            found: int = sum(1 for p in karte if Position(p.row, p.column) in karte)
+            if found != len(karte):
+                raise Exception(f'Expected to find all {len(karte)} positions of a {rows}x{columns} grid but found {found}')
+            del karte
+    return 0
+
+if __name__ == '__main__':
+    exit_code: int = main(sys.argv)
+    sys.exit(exit_code)
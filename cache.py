@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Any, Pattern
+
+# where cached answers are kept, unless told otherwise
+CACHE_DIRECTORY: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.results_cache')
+# the top level modules a source file imports (whether or not they are ours)
+IMPORT_PATTERN: Pattern = re.compile(r'^\s*(?:from|import)\s+(\w+)', re.MULTILINE)
+
+
+def file_digest(path: str) -> str:
+    with open(path, 'rb') as file:
+        result: str = hashlib.file_digest(file, 'sha256').hexdigest()
+    return result
+
+def source_digest(module: str, home: str) -> str:
+    """Hash of a module's source and that of every module of ours it imports, directly or otherwise
+
+    A change to common.py or grid.py can change an answer just as surely as a change to the day module itself.
+    """
+    digest = hashlib.sha256()
+    pending: list[str] = [module]
+    seen: set[str] = set()
+    while pending:
+        name: str = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        path: str = os.path.join(home, f'{name}.py')
+        if not os.path.isfile(path):
+            # a standard library or third party module
+            continue
+        with open(path, 'rb') as file:
+            source: bytes = file.read()
+        digest.update(name.encode() + b'\0' + hashlib.sha256(source).digest())
+        pending.extend(IMPORT_PATTERN.findall(source.decode('utf-8', errors='replace')))
+    result: str = digest.hexdigest()
+    return result
+
+def cache_key(module: str, function: str, input_path: str, parameters: dict[str, Any], home: str) -> str:
+    """Content address of one answer: what went in, the code that worked it out, and how it was asked
+
+    parameters must have a stable repr() (numbers, strings, and lists or dicts of those).
+    """
+    description: str = repr((module, function, file_digest(path=input_path), source_digest(module=module, home=home), sorted(parameters.items())))
+    result: str = hashlib.sha256(description.encode()).hexdigest()
+    return result
+
+
+class ResultCache:
+    """Answers on disk, one small JSON file per key
+
+    Nothing is ever invalidated as such ... a change to the input or the code changes the key, and stale entries are
+    simply never asked for again (clear() gets rid of them).
+    """
+    def __init__(self, directory: str = CACHE_DIRECTORY) -> None:
+        self.directory = directory
+
+    def path_of(self, key: str) -> str:
+        # fan out over a couple of hundred subdirectories, so that no one directory grows too large
+        result: str = os.path.join(self.directory, key[:2], f'{key}.json')
+        return result
+
+    def get(self, key: str) -> dict[str, Any]|None:
+        try:
+            with open(self.path_of(key=key), 'r') as file:
+                result: dict[str, Any] = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return result
+
+    def put(self, key: str, entry: dict[str, Any]) -> bool:
+        """Remember an entry; False (and nothing written) if it cannot be stored as JSON"""
+        try:
+            text: str = json.dumps(entry)
+        except TypeError:
+            return False
+        path: str = self.path_of(key=key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename, so that a reader never sees half an entry
+        partial: str = f'{path}.{os.getpid()}.partial'
+        with open(partial, 'w') as file:
+            file.write(text)
+        os.replace(partial, path)
+        return True
+
+    def clear(self) -> int:
+        """Forget everything; returns the number of entries removed"""
+        result: int = 0
+        if not os.path.isdir(self.directory):
+            return result
+        for parent, directories, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith('.json'):
+                    os.remove(os.path.join(parent, filename))
+                    result += 1
+        return result
+
+
+def test():
+    import tempfile
+    with tempfile.TemporaryDirectory() as home:
+        for name, source in [('day_test', 'import sys\nfrom helper import thing\n'), ('helper', 'thing = 1\n')]:
+            with open(os.path.join(home, f'{name}.py'), 'w') as file:
+                file.write(source)
+        input_path: str = os.path.join(home, 'input.txt')
+        with open(input_path, 'w') as file:
+            file.write('1 2 3\n')
+        key: str = cache_key(module='day_test', function='part_one', input_path=input_path, parameters={'count': 25}, home=home)
+        assert(key == cache_key(module='day_test', function='part_one', input_path=input_path, parameters={'count': 25}, home=home))
+        assert(key != cache_key(module='day_test', function='part_one', input_path=input_path, parameters={'count': 75}, home=home))
+
+        cache: ResultCache = ResultCache(directory=os.path.join(home, 'cache'))
+        assert(cache.get(key=key) is None)
+        assert(cache.put(key=key, entry={'answer': 55312}))
+        assert(cache.get(key=key) == {'answer': 55312})
+        assert(not cache.put(key=key, entry={'answer': object()}))
+
+        # changing a module we import, or the input, changes the key
+        with open(os.path.join(home, 'helper.py'), 'w') as file:
+            file.write('thing = 2\n')
+        changed: str = cache_key(module='day_test', function='part_one', input_path=input_path, parameters={'count': 25}, home=home)
+        assert(changed != key)
+        with open(input_path, 'a') as file:
+            file.write('4\n')
+        assert(cache_key(module='day_test', function='part_one', input_path=input_path, parameters={'count': 25}, home=home) != changed)
+        assert(cache.clear() == 1)
+    return
+
+def main(argv: list[str]):
+    test()
+    return
+
+if __name__ == '__main__':
+    main(sys.argv)
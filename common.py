@@ -1,8 +1,24 @@
+import gzip
+import os
 import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
+from itertools import chain, compress, repeat
 from math import floor
-from typing import Pattern
+from mmap import mmap, ACCESS_READ
+from operator import add
+from typing import BinaryIO, ClassVar, Iterable, Iterator, Pattern, Sequence
+
+try:
+    import zstandard
+except ImportError:
+    # only needed for reading .zst inputs
+    zstandard = None
 
 FLOATING_POINT_PATTERN_NO_WHITESPACE: Pattern = re.compile(r'^[-+]?([0-9]*\.[0-9]+|[0-9]+)$')
 FLOATING_POINT_PATTERN_WHITESPACE_OK: Pattern = re.compile(r'^\s*[-+]?([0-9]*\.[0-9]+|[0-9]+)\s*$')
@@ -14,6 +30,10 @@ TIME_PATTERN: Pattern = re.compile(r'^([0-2]?\d):([0-5]\d)(:([0-5]\d))?$')
 #^\s*(x|c(ol(umn)?)?)\s*=\s*[-+]?([0-9]+(\.[0-9]+)?)$
 EXPLICIT_COLUMN_PATTERN = re.compile(r'^\s*(x|c(ol(umn)?)?)\s*=\s*[-+]?([0-9]+(\.[0-9]+)?)\s*$', re.IGNORECASE)
 EXPLICIT_ROW_PATTERN = re.compile(r'^\s*(y|r(ow)?)\s*=\s*[-+]?([0-9]+(\.[0-9]+)?)\s*$', re.IGNORECASE)
+# bytes read at a time by stream_blocks() / stream_lines()
+BLOCK_SIZE: int = 1 << 20
+# number of distinct strings (and tuples) parse_position() (and position_from_pair()) remember
+POSITION_CACHE_SIZE: int = 65536
 
 EAST: int = 0
 SOUTH_EAST: int = 1
@@ -25,28 +45,73 @@ NORTH: int = 6
 NORTH_EAST: int = 7
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Position:
     row: int
     column: int
 
+    # optional intern cache; when enabled (see Position.intern()) positions inside the interned extent are
+    # handed out as shared instances instead of being allocated afresh each time.
+    _interned_rows: ClassVar[int] = 0
+    _interned_columns: ClassVar[int] = 0
+    _interned: ClassVar[list['Position|None']] = []
+
     def __init__(self, row: int, column: int):
-        if isinstance(row, int):
-            self.row = row
-        elif isinstance(row, float):
-            self.row = int(round(row))
-        elif isinstance(row, str):
-            self.row = int(row)
-        else:
-            raise ValueError(f'Expected int for row, but received {type(row)}')
-        if isinstance(column, int):
-            self.column = column
-        elif isinstance(column, float):
-            self.column = int(round(column))
-        elif isinstance(column, str):
-            self.column = int(column)
+        # fast path ... plain ints (by far the most common case) need no coercion at all
+        if type(row) is not int:
+            row = Position._coerce(value=row, name='row')
+        if type(column) is not int:
+            column = Position._coerce(value=column, name='column')
+        # we are frozen, so go straight to the slots rather than via __setattr__
+        _set_row(self, row)
+        _set_column(self, column)
+        return
+
+    @staticmethod
+    def _coerce(value: int|float|str, name: str) -> int:
+        result: int
+        if isinstance(value, int):
+            result = int(value)
+        elif isinstance(value, float):
+            result = int(round(value))
+        elif isinstance(value, str):
+            result = int(value)
         else:
-            raise ValueError(f'Expected int for column, but received {type(column)}')
+            raise ValueError(f'Expected int for {name}, but received {type(value)}')
+        return result
+
+    @classmethod
+    def at(cls, row: int, column: int) -> 'Position':
+        """Obtain the position at row, column ... shared from the intern cache if it falls within the interned extent
+
+        Unlike the constructor, row and column MUST already be ints; no coercion takes place.
+        """
+        if 0 <= row < cls._interned_rows and 0 <= column < cls._interned_columns:
+            index: int = row * cls._interned_columns + column
+            result: Position|None = cls._interned[index]
+            if result is None:
+                result = _make_position(row, column)
+                cls._interned[index] = result
+            return result
+        return _make_position(row, column)
+
+    @classmethod
+    def intern(cls, extent: 'Position|tuple[int, int]|None') -> None:
+        """Enable the intern cache for all positions within the specified extent (or disable it when extent is None)
+
+        Slots are only populated as positions are asked for, but the cache holds one slot per cell
+        of the extent, so only switch this on for extents that are walked repeatedly.
+        """
+        if extent is None:
+            cls._interned_rows = 0
+            cls._interned_columns = 0
+            cls._interned = []
+            return
+        rows: int = int(extent[0]) if isinstance(extent, tuple) else extent.row
+        columns: int = int(extent[1]) if isinstance(extent, tuple) else extent.column
+        cls._interned_rows = rows
+        cls._interned_columns = columns
+        cls._interned = [None] * (rows * columns)
         return
 
     def __str__(self):
@@ -54,45 +119,57 @@ class Position:
         return result
 
     def __hash__(self) -> int:
-        result: int = int(self.row) << 16
-        result += int(self.column)
+        # row in the high word, column (biased into 0 .. 2^32 - 2) in the low word. That is one-to-one, and clear of
+        # -1 (which python quietly turns into -2), for rows within +/- 2^28 and 32 bit signed columns short of the
+        # very top one; beyond 2^28 rows python would start folding the hash modulo 2^61 - 1. Anything outside that
+        # falls back to hashing the tuple ... still correct, just no longer guaranteed collision free.
+        row: int = self.row
+        column: int = self.column
+        if -0x10000000 <= row < 0x10000000 and -0x80000000 <= column < 0x7fffffff:
+            return (row << 32) + column + 0x80000000
+        result: int = hash((row, column))
         return result
 
-    def __eq__(self, other: 'Position'):
+    def __eq__(self, other: 'Position|tuple[int, int]|str'):
+        if type(other) is Position:
+            # fast path; straight comparison, nothing allocated or parsed.
+            return self.row == other.row and self.column == other.column
+        if not isinstance(other, (tuple, str, Position)):
+            return NotImplemented
         other = Position.as_position(other)
         result: bool = self.row == other.row and self.column == other.column
         return result
 
     def add(self, other: 'Position') -> 'Position':
+        if type(other) is Position:
+            # fast path; no need to inspect or coerce anything
+            return Position.at(self.row + other.row, self.column + other.column)
         delta_row: int
         delta_column: int
-        if isinstance(other, Position):
-            delta_row: int = other.row
-            delta_column: int = other.column
-        elif isinstance(other, tuple) and (isinstance(other[0], int) or isinstance(other[0], float)) and (
+        if isinstance(other, tuple) and (isinstance(other[0], int) or isinstance(other[0], float)) and (
                 isinstance(other[1], int) or isinstance(other[1], float)):
             delta_row: int = int(other[0])
             delta_column: int = int(other[1])
         else:
             raise Exception(f'Expected Position, but provided position is of type ({type(other)}')
 
-        result: Position = Position(row=self.row + delta_row, column=self.column + delta_column)
+        result: Position = Position.at(row=self.row + delta_row, column=self.column + delta_column)
         return result
 
     def subtract(self, other: 'Position') -> 'Position':
+        if type(other) is Position:
+            # fast path; no need to inspect or coerce anything
+            return Position.at(self.row - other.row, self.column - other.column)
         delta_row: int
         delta_column: int
-        if isinstance(other, Position):
-            delta_row: int = other.row
-            delta_column: int = other.column
-        elif isinstance(other, tuple) and (isinstance(other[0], int) or isinstance(other[0], float)) and (
+        if isinstance(other, tuple) and (isinstance(other[0], int) or isinstance(other[0], float)) and (
                 isinstance(other[1], int) or isinstance(other[1], float)):
             delta_row: int = int(other[0])
             delta_column: int = int(other[1])
         else:
             raise Exception(f'Expected Position, but provided position is of type ({type(other)}')
 
-        result: Position = Position(row=self.row - delta_row, column=self.column - delta_column)
+        result: Position = Position.at(row=self.row - delta_row, column=self.column - delta_column)
         return result
 
     def adjacent(self, direction: int) -> 'Position':
@@ -100,43 +177,15 @@ class Position:
 
     @classmethod
     def as_position(cls, candidate: str | tuple[int, int]) -> 'Position':
+        kind: type = type(candidate)
+        # already a Position ... immutable, so there is no need for a copy
+        if kind is Position:
+            return candidate
+        if kind is tuple and len(candidate) == 2 and type(candidate[0]) is int and type(candidate[1]) is int:
+            return position_from_pair(candidate)
         result: Position | None = None
         if isinstance(candidate, str):
-            # string formats supported;
-            # nnnn,nnnn = row,column
-            # x=nnnn,y=nnnn = column, row
-            # row=nnnn, column=nnnn = row, column
-
-            # peel off any brackets around the string
-            if candidate.strip().startswith('(') and candidate.strip().endswith(')'):
-                first_bracket_pos: int = candidate.find('(')
-                candidate = candidate[first_bracket_pos + 1:]
-                last_bracket_pos: int = candidate.rfind(')')
-                candidate = candidate[:last_bracket_pos]
-
-            row: int | None = None
-            column: int | None = None
-            bits: list[str] = candidate.split(',')
-            if len(bits) == 2:
-                column_bits = EXPLICIT_COLUMN_PATTERN.match(bits[0])
-                row_bits = EXPLICIT_ROW_PATTERN.match(bits[0])
-                if row_bits:
-                    row = parse_int(row_bits.group(3))
-                elif column_bits:
-                    column = parse_int(column_bits.group(4))
-                else:
-                    row = parse_int(candidate=bits[0])
-
-                column_bits = EXPLICIT_COLUMN_PATTERN.match(bits[1])
-                row_bits = EXPLICIT_ROW_PATTERN.match(bits[1])
-                if row_bits:
-                    row = parse_int(row_bits.group(3))
-                elif column_bits:
-                    column = parse_int(column_bits.group(4))
-                else:
-                    column = parse_int(candidate=bits[0])
-
-                result = Position(row=row, column=column)
+            result = parse_position(str(candidate))
         elif isinstance(candidate, tuple) and len(candidate) == 2 and (
                 isinstance(candidate[0], int) or isinstance(candidate[0], float)) and (
                 isinstance(candidate[1], int) or isinstance(candidate[1], float)):
@@ -150,6 +199,59 @@ class Position:
         return result
 
 
+@lru_cache(maxsize=POSITION_CACHE_SIZE)
+def position_from_pair(candidate: tuple[int, int]) -> Position:
+    """Position for a (row, column) tuple of ints; cached, since a dictionary hit is cheaper than building a Position"""
+    result: Position = Position.at(candidate[0], candidate[1])
+    return result
+
+@lru_cache(maxsize=POSITION_CACHE_SIZE)
+def parse_position(candidate: str) -> Position | None:
+    """Parse a position from a string; results are cached, since the same coordinates tend to be asked for again and again
+
+    string formats supported;
+    nnnn,nnnn = row,column
+    x=nnnn,y=nnnn = column, row
+    row=nnnn, column=nnnn = row, column
+    """
+    # peel off any brackets around the string
+    if candidate.strip().startswith('(') and candidate.strip().endswith(')'):
+        first_bracket_pos: int = candidate.find('(')
+        candidate = candidate[first_bracket_pos + 1:]
+        last_bracket_pos: int = candidate.rfind(')')
+        candidate = candidate[:last_bracket_pos]
+
+    bits: list[str] = candidate.split(',')
+    if len(bits) != 2:
+        return None
+    # plain numbers need no regex at all
+    row: int | None = parse_int(candidate=bits[0]) if '=' not in bits[0] else None
+    column: int | None = parse_int(candidate=bits[1]) if '=' not in bits[1] else None
+    for bit in bits:
+        if '=' not in bit:
+            continue
+        row_bits = EXPLICIT_ROW_PATTERN.match(bit)
+        column_bits = EXPLICIT_COLUMN_PATTERN.match(bit)
+        if row_bits:
+            row = parse_int(row_bits.group(3))
+        elif column_bits:
+            column = parse_int(column_bits.group(4))
+    result: Position = Position(row=row, column=column)
+    return result
+
+
+# frozen dataclass; these write straight into the slots, bypassing the (forbidden) __setattr__
+_set_row = Position.row.__set__
+_set_column = Position.column.__set__
+_new_object = object.__new__
+
+def _make_position(row: int, column: int) -> Position:
+    """Trusted constructor for ints we have computed ourselves; skips __init__ (and its type checks) entirely"""
+    result: Position = _new_object(Position)
+    _set_row(result, row)
+    _set_column(result, column)
+    return result
+
 STEP_DIRECTIONS_BY_DIRECTION: dict[int, Position] = {
     EAST: Position(row=0, column=1),
     SOUTH_EAST: Position(1,1),
@@ -161,6 +263,85 @@ STEP_DIRECTIONS_BY_DIRECTION: dict[int, Position] = {
     NORTH_EAST: Position(-1,1)
 }
 
+# batch position arithmetic ... rows and columns are held in two parallel arrays (array('i'), array('q'), lists,
+# or numpy arrays) and each operation is applied to every position at once. numpy arrays are handed straight to
+# numpy's own vectorised arithmetic; anything else comes back as an array of the same typecode (or 'q').
+Coordinates = Sequence[int]
+
+def _is_ndarray(candidate: Coordinates) -> bool:
+    result: bool = hasattr(candidate, 'ndim') and hasattr(candidate, 'dtype')
+    return result
+
+def _typecode(candidate: Coordinates) -> str:
+    result: str = candidate.typecode if isinstance(candidate, array) else 'q'
+    return result
+
+def _as_pair(candidate: 'Position|tuple[int, int]') -> tuple[int, int]:
+    result: tuple[int, int]
+    if isinstance(candidate, Position):
+        result = (candidate.row, candidate.column)
+    elif isinstance(candidate, tuple) and len(candidate) == 2:
+        result = (int(candidate[0]), int(candidate[1]))
+    else:
+        raise Exception(f'Expected Position or tuple, but received {type(candidate)}')
+    return result
+
+def _offset(values: Coordinates, amount: int) -> Coordinates:
+    if _is_ndarray(values):
+        return values + amount
+    if amount == 0:
+        return array(_typecode(values), values)
+    result: array = array(_typecode(values), map(add, values, repeat(amount, len(values))))
+    return result
+
+def translate_positions(rows: Coordinates, columns: Coordinates, delta: 'Position|tuple[int, int]') -> tuple[Coordinates, Coordinates]:
+    """Shift every (row, column) pair by the same delta"""
+    if len(rows) != len(columns):
+        raise Exception(f'Expected the same number of rows and columns, but received {len(rows)} and {len(columns)}')
+    delta_row, delta_column = _as_pair(candidate=delta)
+    result: tuple[Coordinates, Coordinates] = (_offset(rows, delta_row), _offset(columns, delta_column))
+    return result
+
+def step_positions(rows: Coordinates, columns: Coordinates, direction: int, distance: int = 1) -> tuple[Coordinates, Coordinates]:
+    """Move every (row, column) pair distance steps in the specified direction"""
+    step: Position = STEP_DIRECTIONS_BY_DIRECTION[direction]
+    result: tuple[Coordinates, Coordinates] = translate_positions(rows=rows, columns=columns, delta=(step.row * distance, step.column * distance))
+    return result
+
+def positions_within_bounds(rows: Coordinates, columns: Coordinates, extent: 'Position|tuple[int, int]') -> Sequence[bool]:
+    """Mask of which (row, column) pairs lie within 0 <= row < extent.row and 0 <= column < extent.column
+
+    For numpy input the mask is a numpy bool array; otherwise a bytearray of 0/1 flags.
+    """
+    if len(rows) != len(columns):
+        raise Exception(f'Expected the same number of rows and columns, but received {len(rows)} and {len(columns)}')
+    number_rows, number_columns = _as_pair(candidate=extent)
+    if _is_ndarray(rows):
+        return (rows >= 0) & (rows < number_rows) & (columns >= 0) & (columns < number_columns)
+    result: bytearray = bytearray(0 <= r < number_rows and 0 <= c < number_columns for r, c in zip(rows, columns))
+    return result
+
+def select_positions(rows: Coordinates, columns: Coordinates, mask: Sequence[bool]) -> tuple[Coordinates, Coordinates]:
+    """Keep only those (row, column) pairs whose mask entry is set (typically the output of positions_within_bounds)"""
+    if _is_ndarray(rows):
+        return rows[mask], columns[mask]
+    result: tuple[Coordinates, Coordinates] = (array(_typecode(rows), compress(rows, mask)), array(_typecode(columns), compress(columns, mask)))
+    return result
+
+def arrays_from_positions(positions: Iterable['Position|tuple[int, int]'], typecode: str = 'q') -> tuple[array, array]:
+    rows: array = array(typecode)
+    columns: array = array(typecode)
+    for position in positions:
+        row, column = _as_pair(candidate=position)
+        rows.append(row)
+        columns.append(column)
+    result: tuple[array, array] = (rows, columns)
+    return result
+
+def positions_from_arrays(rows: Coordinates, columns: Coordinates) -> list[Position]:
+    result: list[Position] = [Position.at(int(r), int(c)) for r, c in zip(rows, columns)]
+    return result
+
 def direction_from_character(candidate: str) -> int:
     result: int = None
     if candidate == '<':
@@ -173,24 +354,69 @@ def direction_from_character(candidate: str) -> int:
         result = SOUTH
     return result
 
+def open_input(path: str) -> BinaryIO:
+    """Open an input file for (binary) reading, decompressing on the fly if it ends in .gz or .zst"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise Exception(f'Reading {path} requires the zstandard package, which is not installed')
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+def stream_blocks(path: str, block_size: int = BLOCK_SIZE, memory_map: bool = False) -> Iterator[bytes]:
+    """The contents of the file, block_size bytes at a time (the last block may be shorter)"""
+    if memory_map and not path.endswith(('.gz', '.zst')):
+        if os.path.getsize(path) == 0:
+            return
+        with open(path, 'rb') as file, mmap(file.fileno(), 0, access=ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), block_size):
+                yield mapped[start:start + block_size]
+        return
+    with open_input(path=path) as file:
+        while block := file.read(block_size):
+            yield block
+
+def stream_lines(path: str, strip: bool = True, memory_map: bool = False, encoding: str = 'utf-8', block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    """Lines of the file (stripped, by default), one at a time as they are read rather than all at once
+
+    Lines are cut out of large blocks, so the file is never held in memory as a whole; compressed files (.gz, .zst)
+    are decompressed as we go.
+    """
+    remainder: bytes = b''
+    for block in stream_blocks(path=path, block_size=block_size, memory_map=memory_map):
+        lines: list[bytes] = (remainder + block).split(b'\n') if remainder else block.split(b'\n')
+        # the last piece may be the start of a line that continues in the next block
+        remainder = lines.pop()
+        for line in lines:
+            text: str = line.decode(encoding)
+            yield text.strip() if strip else text.rstrip('\r')
+    if remainder:
+        text = remainder.decode(encoding)
+        yield text.strip() if strip else text.rstrip('\r')
+
 def read_lines_from_file(path: str) -> list[str]:
-    result: list[str] = []
-    with open(path, 'r') as file:
-        for line in file:
-            result.append(line.strip())
+    result: list[str] = list(stream_lines(path=path))
     return result
 
+# only_digits() patterns, by (allow_decimal_point, whitespace_ok)
+DIGIT_PATTERNS: dict[tuple[bool, bool], Pattern] = {
+    (False, False): INTEGER_PATTERN_NO_WHITESPACE,
+    (False, True): INTEGER_PATTERN_WHITESPACE_OK,
+    (True, False): FLOATING_POINT_PATTERN_NO_WHITESPACE,
+    (True, True): FLOATING_POINT_PATTERN_WHITESPACE_OK,
+}
+
 def only_digits(candidate: str, whitespace_ok: bool = False, allow_decimal_point: bool = False) -> bool:
     """Determine if the specified string only contains digits"""
 
     if isinstance(candidate, int):
         return True
-    pattern: Pattern = INTEGER_PATTERN_NO_WHITESPACE
-    if allow_decimal_point:
-        pattern = FLOATING_POINT_PATTERN_NO_WHITESPACE if not whitespace_ok else FLOATING_POINT_PATTERN_WHITESPACE_OK
-    else:
-        pattern = INTEGER_PATTERN_NO_WHITESPACE if not whitespace_ok else INTEGER_PATTERN_WHITESPACE_OK
-    result: bool = bool(re.match(pattern=pattern, string=candidate))
+    if not allow_decimal_point:
+        # str.isdecimal() is exactly the \d class; the only thing the pattern also allows is a trailing newline (that $ skips)
+        refined: str = candidate.strip() if whitespace_ok else candidate[:-1] if candidate.endswith('\n') else candidate
+        return refined.isdecimal()
+    result: bool = DIGIT_PATTERNS[(allow_decimal_point, whitespace_ok)].match(candidate) is not None
     return result
 
 def only_hex_digits(candidate: str, whitespace_ok: bool = False) -> bool:
@@ -201,6 +427,13 @@ def only_hex_digits(candidate: str, whitespace_ok: bool = False) -> bool:
 
 
 def parse_int(candidate: str|float|int|Decimal) -> int|None:
+    # nearly everything we parse is a plain string of digits ... so just hand it to int(), which is more forgiving
+    # than we are only in accepting underscores between digits.
+    if type(candidate) is str and '_' not in candidate:
+        try:
+            return int(candidate)
+        except ValueError:
+            pass
     result: int|None = None
     if isinstance(candidate, int):
         result = candidate
@@ -221,6 +454,12 @@ def parse_int(candidate: str|float|int|Decimal) -> int|None:
     return result
 
 def parse_float(candidate: str|float|int) -> float|None:
+    # (the floating point pattern only accepts ASCII digits)
+    if type(candidate) is str and '_' not in candidate and candidate.isascii():
+        try:
+            return int(candidate)
+        except ValueError:
+            pass
     result: float|None = None
     if isinstance(candidate, float):
         result = candidate
@@ -236,6 +475,118 @@ def parse_float(candidate: str|float|int) -> float|None:
             result = floor(float(refined))
     return result
 
+def parse_ints(candidates: Iterable[str|float|int|Decimal], typecode: str = 'q') -> array:
+    """Parse a whole column of values into an array in one go
+
+    The whole column is handed to int() at once; only if that fails (or a value has an underscore in it) do we fall
+    back to parse_int(), value by value. Anything that cannot be parsed as an integer at all is an error.
+    """
+    values: list = candidates if isinstance(candidates, list) else list(candidates)
+    try:
+        # (join() also weeds out anything that is not a string)
+        if '_' not in ''.join(values):
+            return array(typecode, map(int, values))
+    except (TypeError, ValueError):
+        pass
+    result: array = array(typecode)
+    for value in values:
+        parsed: int|None = parse_int(candidate=value)
+        if parsed is None:
+            raise Exception(f'Expected an integer but found {value!r}')
+        result.append(parsed)
+    return result
+
+
+class SortedInts:
+    """Integers accumulated in any order, handed back in ascending order
+
+    add() and extend() simply append to an array, and the whole lot is sorted once, the first time the values are
+    read; insort() keeps the values in order as it goes (O(n) per value, so only worth it when reads and additions
+    are interleaved). Values spread over a range no wider than there are values are counted rather than compared,
+    which is several times quicker than sorting (and gives us counts() for free).
+    """
+    def __init__(self, values: Iterable[int] = (), typecode: str = 'q') -> None:
+        self.values: array = array(typecode, values)
+        self.ordered: bool = len(self.values) < 2
+        self.tally: dict[int, int]|None = None
+
+    def add(self, value: int) -> None:
+        self.values.append(value)
+        self.ordered = False
+        self.tally = None
+
+    def extend(self, values: Iterable[int]) -> None:
+        self.values.extend(values)
+        self.ordered = False
+        self.tally = None
+
+    def insort(self, value: int) -> None:
+        insort(self.ordered_values(), value)
+        self.tally = None
+
+    def ordered_values(self) -> array:
+        values: array = self.values
+        if self.ordered or len(values) < 2:
+            # (nothing to sort ... and max() / min() would fail on nothing at all)
+            self.ordered = True
+            return values
+        if max(values) - min(values) < len(values):
+            # plenty of repeats (or a dense range) ... count them, and lay each value out as many times as it occurs
+            self.tally = Counter(values)
+            ordered: array = array(values.typecode)
+            for value in sorted(self.tally):
+                ordered.extend(repeat(value, self.tally[value]))
+            self.values = ordered
+        else:
+            self.values = array(values.typecode, sorted(values))
+        self.ordered = True
+        return self.values
+
+    def counts(self) -> dict[int, int]:
+        """Number of times each value occurs"""
+        if self.tally is None:
+            self.tally = Counter(self.values)
+        return self.tally
+
+    def count(self, value: int) -> int:
+        values: array = self.ordered_values()
+        result: int = bisect_right(values, value) - bisect_left(values, value)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> int:
+        return self.ordered_values()[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ordered_values())
+
+def sorted_columns(lines: Iterable[str], columns: int, chunk_lines: int = 65536, typecode: str = 'q') -> list[SortedInts]:
+    """Each whitespace separated column of integers in lines, accumulated (and so sorted) separately
+
+    The lines are parsed a chunk at a time with parse_ints(), so any number of them may be streamed through without
+    per-line Python work ... or holding more than a chunk of text at once. Blank lines are skipped.
+    """
+    result: list[SortedInts] = [SortedInts(typecode=typecode) for i in range(columns)]
+    chunk: list[str] = []
+    for line in chain(lines, [None]):
+        if line is not None:
+            chunk.append(line)
+            if len(chunk) < chunk_lines:
+                continue
+        # split line by line (map() keeps that out of the interpreter loop) so that every line can be held to account
+        fields: list[list[str]] = list(map(str.split, chunk))
+        if not set(map(len, fields)) <= {0, columns}:
+            bad: str = next(line for line, f in zip(chunk, fields) if len(f) not in (0, columns))
+            raise Exception(f'Expected {columns} integers on every line, but found {bad.strip()!r}')
+        chunk.clear()
+        tokens: list[str] = list(chain.from_iterable(fields))
+        values: array = parse_ints(tokens, typecode=typecode)
+        for i, column in enumerate(result):
+            column.extend(values[i::columns])
+    return result
+
 def parse_boolean(candidate: str) -> bool:
     if isinstance(candidate, bool):
         return candidate
@@ -249,3 +600,42 @@ def parse_boolean(candidate: str) -> bool:
 
     result = re.match(r'^[ytj]', t, re.IGNORECASE) is not None
     return result
+
+
+def test():
+    # distinct hashes right up to the edges of the packed range, and still equal (if not distinct) beyond it
+    edges: list[Position] = [Position(r, c) for r in (-0x10000000, -1, 0, 0x0fffffff) for c in (-0x80000000, -1, 0, 0x7ffffffd, 0x7ffffffe)]
+    assert(len(set(hash(p) for p in edges)) == len(edges))
+    for far in [Position(-1, 0x7fffffff), Position(1 << 40, 3), Position(-(1 << 29), -(1 << 33))]:
+        assert(hash(far) == hash(Position(far.row, far.column)))
+        assert({far: True}[Position(far.row, far.column)])
+    values: SortedInts = SortedInts([5, 1, 3, 3])
+    values.add(2)
+    values.insort(4)
+    assert(list(values) == [1, 2, 3, 3, 4, 5])
+    assert(values.count(3) == 2 and values.counts()[3] == 2)
+    assert(list(SortedInts([10 ** 12, -5, 7])) == [-5, 7, 10 ** 12])
+    # nothing at all (or a single value) needs no sorting
+    empty: SortedInts = SortedInts()
+    empty.extend([])
+    assert(list(empty) == [] and empty.count(1) == 0)
+    alpha, beta = sorted_columns(lines=[], columns=2)
+    assert(len(alpha) == 0 and list(beta) == [])
+    alpha, beta = sorted_columns(lines=['3   1', '', '2 5'], columns=2)
+    assert(list(alpha) == [2, 3] and list(beta) == [1, 5])
+    # the right number of integers overall is not enough ... every line must hold one per column
+    try:
+        sorted_columns(lines=['1 2 3', '4'], columns=2)
+        assert(False)
+    except Exception as e:
+        assert("'1 2 3'" in str(e))
+    alpha, beta = sorted_columns(lines=['3   4', '4   3', '', '2 5'], columns=2)
+    assert(list(alpha) == [2, 3, 4] and list(beta) == [3, 4, 5])
+    return
+
+def main(argv: list[str]):
+    test()
+    return
+
+if __name__ == '__main__':
+    main(sys.argv)
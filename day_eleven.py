@@ -3,6 +3,9 @@ import re
 from copy import deepcopy
 from math import floor
 
+from instrument import traced
+import sink
+
 EQUATION_PATTERN = re.compile(r'^\s*(\d+):(\s*(\d+))+\s*$')
 ADD: int = 0
 MULTIPLY: int = 1
@@ -33,6 +36,7 @@ def extract_numbers_to_dict(candidate: str) -> dict[int, int]:
         result[value] += 1
     return result
 
+@traced
 def blink(stones: list[int]) -> list[int]:
     result: list[int] = []
     for stone in stones:
@@ -50,6 +54,7 @@ def blink(stones: list[int]) -> list[int]:
             result.append(stone * 2024)
     return result
 
+@traced
 def blink_too(stones: dict[int, int]) -> dict[int, int]:
     result: dict[int,int] = {}
     for v, n in stones.items():
@@ -99,7 +104,7 @@ def p45(path: str, count: int) -> int:
             for i in range(count):
                 stones = blink_too(stones=stones)
                 result = sum([v for v in stones.values()])
-                print(f'{i=}: {result}')
+                sink.debug(lambda: f'{i=}: {result}')
             line_number += 1
     return result
 
@@ -127,7 +132,7 @@ def part_two(path: str) -> int:
             stones: list[int] = extract_numbers(candidate=line.strip())
             for i in range(75):
                 stones = blink(stones=stones)
-                print(f'{i=},{len(stones)=}')
+                sink.debug(lambda: f'{i=},{len(stones)=}')
             result = len(stones)
             line_number += 1
     return result
@@ -141,17 +146,21 @@ def main(argv: list[str]):
     verbose = False
     result: int = 0
     result = p45(path='day_eleven_test_input.txt', count=25)
+    sink.flush()
     print(f'part one: {result=} for test data')
     if result != 55312:
         raise Exception(f'Test failed, expected 55312 but instead got {result}')
     result = p45(path='day_eleven_input.txt', count=25)
+    sink.flush()
     print(f'part one: {result=} for actual data')
 
     result = p45(path='day_eleven_test_input.txt', count=75)
+    sink.flush()
     print(f'part two: {result=} for test data')
 #    if result != 11387:
 #        raise Exception(f'Test failed, expected 11387 but instead got {result}')
     result: int = p45(path='day_eleven_input.txt', count=75)
+    sink.flush()
     print(f'part two: {result=} for actual data')
 
     return 0
@@ -6,12 +6,14 @@ from math import floor
 import math
 from time import sleep
 
+from records import RecordFormat, Records
+
 verbose: bool = False
 very_verbose: bool = False
 
 PI: float =  3.14159265358979323846
 
-ROBOT_PATTERN: re.Pattern = re.compile(r'^p=([+\-]?\d+),([+\-]?\d+)\s+v=([+\-]?\d+),([+\-]?\d+)\s*$', re.IGNORECASE)
+ROBOT_FORMAT: RecordFormat = RecordFormat('p={x:int},{y:int} v={dx:int},{dy:int}', flags=re.IGNORECASE)
 
 
 class Vector:
@@ -113,19 +115,13 @@ def extract_robots(path: str, grid_width: int, grid_height: int) -> list[Robot]:
         raise Exception(f'Specified path {path} not a file we can read')
 
     result: list[Robot] = []
-    
-    with open(path, 'r') as file:
-        line_number: int = 0
-        for line in file:
-            line_number += 1
-            text: str = line.strip()
-            bits = ROBOT_PATTERN.match(text)
-            if bits is None:
-                continue
-            position=IntegerVector(x=int(bits[1]), y=int(bits[2]))
-            velocity=IntegerVector(x=int(bits[3]), y=int(bits[4]))
-            robot = Robot(position=position, velocity=velocity, grid_width=grid_width, grid_height=grid_height)
-            result.append(robot)
+
+    records: Records = ROBOT_FORMAT.parse_file(path=path)
+    for x, y, dx, dy in records.rows():
+        position=IntegerVector(x=x, y=y)
+        velocity=IntegerVector(x=dx, y=dy)
+        robot = Robot(position=position, velocity=velocity, grid_width=grid_width, grid_height=grid_height)
+        result.append(robot)
 
     return result
 
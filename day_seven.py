@@ -1,9 +1,11 @@
 import sys
-import re
 from copy import deepcopy
 from math import floor
 
-EQUATION_PATTERN = re.compile(r'^\s*(\d+):(\s*(\d+))+\s*$')
+from records import RecordFormat, Records
+import sink
+
+EQUATION_FORMAT: RecordFormat = RecordFormat('{expected:int}: {operands:ints}')
 ADD: int = 0
 MULTIPLY: int = 1
 CONCAT: int = 2
@@ -65,64 +67,50 @@ def part_one(path: str) -> int:
     result: int = 0
 
     # sweep one ... gather the ordering information
-    with open(path, 'r') as file:
-        line_number: int = 1
-        for line in file:
-            bits = EQUATION_PATTERN.match(line.strip())
-            if bits is None:
-                continue
-            colon_pos: int = line.find(':')
-            part_alpha: str = line[:colon_pos].strip()
-            part_beta: str = line[colon_pos+1:].strip()
-            expected: int = int(part_alpha)
-            operands: list[int] = [int(o) for o in part_beta.split(' ')]
-            number_pairs: int = len(operands) - 1
-            i: int = 0
-            # we now have to try each possibilities
-            matched_expected: bool = False
-            number_possibilities: int = pow(4, number_pairs)
-            while not matched_expected and i < number_possibilities:
-                calculated: int = 0
-                operators: list[int] = determine_operators(i=i, operands=operands)
-                calculated = calculate(operands=operands, operators=operators)
-                matched_expected = calculated == expected
-                if matched_expected:
-                    result += calculated
-                    print(f'{i=} Found match: {as_text(operands, operators)} == {calculated} at {line_number=}')
-                i += 1
-            line_number += 1
+    equations: Records = EQUATION_FORMAT.parse_file(path=path)
+    line_number: int = 1
+    for expected, operand_values in equations.rows():
+        operands: list[int] = list(operand_values)
+        number_pairs: int = len(operands) - 1
+        i: int = 0
+        # we now have to try each possibilities
+        matched_expected: bool = False
+        number_possibilities: int = pow(4, number_pairs)
+        while not matched_expected and i < number_possibilities:
+            calculated: int = 0
+            operators: list[int] = determine_operators(i=i, operands=operands)
+            calculated = calculate(operands=operands, operators=operators)
+            matched_expected = calculated == expected
+            if matched_expected:
+                result += calculated
+                sink.debug(lambda: f'{i=} Found match: {as_text(operands, operators)} == {calculated} at {line_number=}')
+            i += 1
+        line_number += 1
     return result
 
 def part_two(path: str) -> int:
     result: int = 0
 
     # sweep one ... gather the ordering information
-    with open(path, 'r') as file:
-        line_number: int = 1
-        for line in file:
-            bits = EQUATION_PATTERN.match(line.strip())
-            if bits is None:
-                continue
-            colon_pos: int = line.find(':')
-            part_alpha: str = line[:colon_pos].strip()
-            part_beta: str = line[colon_pos+1:].strip()
-            expected: int = int(part_alpha)
-            operands: list[int] = [int(o) for o in part_beta.split(' ')]
-            number_pairs: int = len(operands) - 1
-            i: int = 0
-            # we now have to try each possibilities
-            matched_expected: bool = False
-            number_possibilities: int = pow(4, number_pairs)
-            while not matched_expected and i < number_possibilities:
-                calculated: int = 0
-                operators: list[int] = determine_operators(i=i, operands=operands)
-                calculated = calculate(operands=operands, operators=operators)
-                matched_expected = calculated == expected
-                if matched_expected:
-                    result += calculated
-                    print(f'{i=} Found match: {as_text(operands, operators)} == {calculated} at {line_number=}')
-                i += 1
-            line_number += 1
+    equations: Records = EQUATION_FORMAT.parse_file(path=path)
+    line_number: int = 1
+    for expected, operand_values in equations.rows():
+        operands: list[int] = list(operand_values)
+        number_pairs: int = len(operands) - 1
+        i: int = 0
+        # we now have to try each possibilities
+        matched_expected: bool = False
+        number_possibilities: int = pow(4, number_pairs)
+        while not matched_expected and i < number_possibilities:
+            calculated: int = 0
+            operators: list[int] = determine_operators(i=i, operands=operands)
+            calculated = calculate(operands=operands, operators=operators)
+            matched_expected = calculated == expected
+            if matched_expected:
+                result += calculated
+                sink.debug(lambda: f'{i=} Found match: {as_text(operands, operators)} == {calculated} at {line_number=}')
+            i += 1
+        line_number += 1
     return result
 
 
@@ -135,6 +123,7 @@ def main(argv: list[str]):
     result: int = 0
     OPERATORS = [ADD, MULTIPLY]
     result = part_one(path='day_seven_test_input.txt')
+    sink.flush()
     print(f'part one: {result=} for test data')
     if result != 3749:
         raise Exception(f'Test failed, expected 3749 but instead got {result}')
@@ -143,10 +132,12 @@ def main(argv: list[str]):
 #
     OPERATORS = [ADD, MULTIPLY, CONCAT]
     result = part_one(path='day_seven_test_input.txt')
+    sink.flush()
     print(f'part two: {result=} for test data')
     if result != 11387:
         raise Exception(f'Test failed, expected 11387 but instead got {result}')
     result: int = part_one(path='day_seven_input.txt')
+    sink.flush()
     print(f'part two: {result=} for actual data')
 
     return 0
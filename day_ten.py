@@ -3,6 +3,8 @@ import re
 from copy import deepcopy
 from math import floor
 
+from instrument import traced
+
 ORDER_LINE_INFO_PATTERN = re.compile(r'^\s*(\d+)\s*\|\s*(\d+)\s*$')
 PAGES_LINE_INFO_PATTERN = re.compile(r'^\s*(\d+)\s*(,\s*(\d+)\s*)*$')
 
@@ -146,6 +148,7 @@ def determine_instructions(i:int) -> list[int]:
         result.append(direction)
     return result
 
+@traced
 def perambulate(map:dict[tuple[int,int],int], starting_point:tuple[int,int], number_rows:int, number_columns:int) -> int:
     # sanity checks
     if starting_point not in map:
@@ -168,6 +171,7 @@ def perambulate(map:dict[tuple[int,int],int], starting_point:tuple[int,int], num
     result = len(summits)
     return result
 
+@traced
 def perambulate_too(map:dict[tuple[int,int],int], starting_point:tuple[int,int], number_rows:int, number_columns:int) -> int:
     # sanity checks
     if starting_point not in map:
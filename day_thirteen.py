@@ -7,19 +7,18 @@ from math import floor, sqrt, atan2
 
 import math
 
+from records import RecordFormat, Records
+
 verbose: bool = False
 very_verbose: bool = False
 
 PI: float =  3.14159265358979323846
 
-COORDINATE_PATTERN: re.Pattern = re.compile(r'^\s*x([+-]?\d+),\s*y([+-]?\d+)$', re.IGNORECASE)
-TARGET_COORDINATE_PATTERN: re.Pattern = re.compile(r'^\s*x=([+-]?\d+),\s*y=([+-]?\d+)$', re.IGNORECASE)
-
-PARSE_STATE_INIT: int = 0
-PARSE_STATE_BUTTON_A: int = 1
-PARSE_STATE_BUTTON_B: int = 2
-PARSE_STATE_TARGET: int = 3
-PARSE_STATE_LIMBO: int = 4
+# button A, button B and the prize, one per line
+MACHINE_FLAGS: int = re.IGNORECASE
+MACHINE_FORMAT: RecordFormat = RecordFormat('Button A: X{ax:int}, Y{ay:int}\nButton B: X{bx:int}, Y{by:int}\nPrize: X={x:int}, Y={y:int}', flags=MACHINE_FLAGS)
+# every machine starts with one of these (matched just as leniently as the format matches it)
+MACHINE_START_PATTERN: re.Pattern = re.compile(r'^\s*Button A:', re.MULTILINE | MACHINE_FLAGS)
 
 class Vector:
     def __init__(self, x: float, y: float):
@@ -164,72 +163,21 @@ def extract_instructions(path: str, target_offset: int = 0) -> list[Instructions
         raise Exception(f'Specified path {path} not a file we can read')
 
     result: list[Instructions] = []
-    
-    parse_state: int = PARSE_STATE_INIT
-    
+
     with open(path, 'r') as file:
-        line_number: int = 0
-        for line in file:
-            line_number += 1
-            text: str = line.strip()
-            if parse_state == PARSE_STATE_INIT:
-                if text.startswith('Button A:'):
-                    parse_state = PARSE_STATE_BUTTON_A
-                    instructions = Instructions()
-                else:
-                    raise Exception(f'Expected "Button A:" but got {text}')
-            elif parse_state == PARSE_STATE_BUTTON_A:
-                if text.startswith('Button B:'):
-                    parse_state = PARSE_STATE_BUTTON_B
-                else:
-                    raise Exception(f'Expected "Button B:" but got {text}')
-            elif parse_state == PARSE_STATE_BUTTON_B:
-                if text.startswith('Prize:'):
-                    parse_state = PARSE_STATE_TARGET
-                else:
-                    raise Exception(f'Expected "Target:" but got {text}')
-            elif parse_state == PARSE_STATE_TARGET:
-                if len(text) == 0:
-                    parse_state = PARSE_STATE_LIMBO
-                    result.append(instructions)
-                else:
-                    raise Exception(f'Expected blank line but got [{text}]')
-            elif parse_state == PARSE_STATE_LIMBO:
-                if text.startswith('Button A:'):
-                    parse_state = PARSE_STATE_BUTTON_A
-                    instructions = Instructions()
-                else:
-                    raise Exception(f'Expected EOF, blank text or button A but got {text}')
-            else:
-                raise Exception(f'Unknown parse state: {parse_state}')
-
-            if parse_state in (PARSE_STATE_BUTTON_A, PARSE_STATE_BUTTON_B):
-                colon_pos: int = text.find(':')
-                if colon_pos < 0:
-                    raise Exception(f'Expected a colon but got {text}')
-                rest: str = text[colon_pos + 1:]
-                bits = COORDINATE_PATTERN.match(rest)
-                if bits is None:
-                    raise Exception(f'Expected coordinates but got {text}')
-                x_text: str = bits.group(1)
-                y_text: str = bits.group(2)
-                x: int = int(x_text)
-                y: int = int(y_text)
-                if parse_state == PARSE_STATE_BUTTON_A:
-                    instructions.button_a = (x, y)
-                else:
-                    instructions.button_b = (x,y)
-            elif parse_state == PARSE_STATE_TARGET:
-                colon_pos: int = text.find(':')
-                if colon_pos < 0:
-                    raise Exception(f'Expected a colon but got {text}')
-                rest: str = text[colon_pos + 1:]
-                bits = TARGET_COORDINATE_PATTERN.match(rest)
-                if bits is None:
-                    raise Exception(f'Expected target coordinates but got {text}')
-                x_text: str = bits.group(1)
-                y_text: str = bits.group(2)
-                instructions.target = (int(x_text) + target_offset, int(y_text) + target_offset)
+        text: str = file.read()
+    # the last machine counts whether or not a blank line follows it
+    records: Records = MACHINE_FORMAT.parse_text(text=text)
+    # so anything we failed to parse shows up as a shortfall of button A lines
+    expected: int = len(MACHINE_START_PATTERN.findall(text))
+    if len(records) != expected:
+        raise Exception(f'Expected {expected} machines (button A, button B, prize) but could only parse {len(records)} in {path}')
+    for ax, ay, bx, by, x, y in records.rows():
+        instructions = Instructions()
+        instructions.button_a = (ax, ay)
+        instructions.button_b = (bx, by)
+        instructions.target = (x + target_offset, y + target_offset)
+        result.append(instructions)
 
     return result
 
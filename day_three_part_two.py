@@ -1,6 +1,8 @@
 import re
 import sys
 
+import sink
+
 #valid_instruction_pattern: re.Pattern = re.compile(r'^(mul|add|del|sub|div)\((\d+),(\d+)\)')
 valid_instruction_pattern: re.Pattern = re.compile(r'^(mul)\((\d+),(\d+)\)')
 
@@ -79,7 +81,7 @@ def main(argv) -> int:
     result: int = 0
     for operation, operand_alpha, operand_beta in operations:
         if operation == 'mul':
-            print(f'{operand_alpha}+{operand_beta}={operand_alpha+operand_beta}')
+            sink.debug(lambda: f'{operand_alpha}+{operand_beta}={operand_alpha+operand_beta}')
             result += operand_alpha * operand_beta
         elif operation == 'add':
             result += operand_alpha + operand_beta
@@ -88,8 +90,9 @@ def main(argv) -> int:
         elif operation == 'div':
             result += operand_alpha / operand_beta
         else:
-            print(f'Unknown operation: {operation}')
+            sink.warning(f'Unknown operation: {operation}')
 
+    sink.flush()
     print(f'{result=}')
     return 0
 
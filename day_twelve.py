@@ -4,6 +4,9 @@ from copy import deepcopy
 from dataclasses import dataclass
 from math import floor
 
+from instrument import traced
+import sink
+
 
 EAST: int = 0
 SOUTH_EAST: int = 1
@@ -205,6 +208,7 @@ def extract_grid(candidate: str|list[str]) -> tuple[dict[tuple[int, int], str],t
     result: tuple[dict[tuple[int, int], str], tuple[int, int]] = (grid, (len(lines), max_width))
     return result
 
+@traced
 def explore(flavour: str, grid: dict[tuple[int, int], str], membership: dict[tuple[int, int], SchreberGarten], position: tuple[int, int], number_rows:int, number_columns: int, breadcrumbs: set[tuple[int, int]] = None, depth: int = 0) -> SchreberGarten|None:
     result: SchreberGarten|None = None
 
@@ -249,7 +253,7 @@ def extract_plots(text: str|list[str]) -> list[SchreberGarten]:
     visited: set[tuple[int, int]] = set()
 
     for row_index in range(number_rows):
-        print(f'{row_index:03d}: ', end='')
+        sink.debug(lambda: f'{row_index:03d}: ', end='')
         for column_index in range(number_columns):
             flavour: str = grid.get((row_index, column_index))
             position: tuple[int, int] = (row_index, column_index)
@@ -263,14 +267,14 @@ def extract_plots(text: str|list[str]) -> list[SchreberGarten]:
                 # join this schrebergarten!!
                 existing_schrebergarten.locations[position] = flavour
                 membership[position] = existing_schrebergarten
-                print('.', end='')
+                sink.debug('.', end='')
             else:
                 # create a brand new schrebergarten
                 new_schrebergarten: SchreberGarten = SchreberGarten(flavour=flavour, locations={(position): flavour})
                 result.append(new_schrebergarten)
                 membership[position] = new_schrebergarten
-                print(flavour, end='')
-        print('')
+                sink.debug(flavour, end='')
+        sink.debug('')
 
     return result
 
@@ -8,17 +8,15 @@ from dataclasses import dataclass
 from common import read_lines_from_file, WEST, EAST, NORTH, SOUTH, direction_from_character, Position, \
     STEP_DIRECTIONS_BY_DIRECTION
 from grid import Grid
+from records import RecordFormat
 
 verbose: bool = False
 very_verbose: bool = False
 DIRECTIONS_PATTERN:  re.Pattern = re.compile(r'^[<^>vV]+$')
+PAIR_FORMAT: RecordFormat = RecordFormat('{left:word} - {right:word}')
 
 def extract_pairs(lines: list[str]) -> list[tuple[str, str]]:
-    result: list[tuple[str, str]] = []
-    for line in lines:
-        if len(line) > 0:
-            pair: list[str] = line.split('-')
-            result.append((pair[0].strip(), pair[1].strip()))
+    result: list[tuple[str, str]] = list(PAIR_FORMAT.parse_lines(lines=lines).rows())
     return result
 
 def part_one(path: str) -> int:
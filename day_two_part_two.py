@@ -1,5 +1,7 @@
 import sys
 
+import sink
+
 def is_safe(candidates: list[int], max_unsafe_count: int = 0) -> bool:
     total_count: int = 0
     unsafe_count: int = 0
@@ -45,7 +47,7 @@ def main(argv) -> int:
         row: list[int] = [int(x) for x in bits]
         total_count += 1
         if is_safe(row, max_unsafe_count=0):
-            print(row)
+            sink.debug(lambda: str(row))
             safe_count += 1
         else:
             we_found_one: bool = False
@@ -59,9 +61,10 @@ def main(argv) -> int:
                 hole_index += 1
             if we_found_one:
                 safe_count += 1
-                print(f'{row=} OK with a shortened row {shortened_row=}')
+                sink.debug(lambda: f'{row=} OK with a shortened row {shortened_row=}')
 
 
+    sink.flush()
     print(f'{safe_count=} of {total_count=}')
     return 0
 
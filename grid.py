@@ -1,34 +1,226 @@
+import os
+import re
+import struct
 import sys
-from dataclasses import dataclass
-from typing import Set
+from array import array
+from dataclasses import dataclass, field
+from mmap import mmap, ACCESS_COPY
+from typing import Iterable, Iterator
 
-from common import EXPLICIT_COLUMN_PATTERN, EXPLICIT_ROW_PATTERN, parse_int, EAST, Position, \
-    STEP_DIRECTIONS_BY_DIRECTION
+from common import EXPLICIT_COLUMN_PATTERN, EXPLICIT_ROW_PATTERN, parse_int, EAST, SOUTH_EAST, SOUTH, SOUTH_WEST, \
+    WEST, NORTH_WEST, NORTH, NORTH_EAST, Position, \
+    STEP_DIRECTIONS_BY_DIRECTION, arrays_from_positions, step_positions, positions_within_bounds, select_positions, \
+    positions_from_arrays
+
+
+# every cell holds a single (latin-1) character, stored as one byte.
+EMPTY: str = '.'
+# lookup table so that reading a cell is a list index rather than a call to chr()
+CHARACTERS: list[str] = [chr(i) for i in range(256)]
+# dense grids are surrounded by a one cell border of this (never a valid cell value), so that stepping off the edge
+# lands on a sentinel rather than needing a bounds test.
+SENTINEL: int = 0
+# the four "square" directions, in the same clockwise order as the direction numbering itself.
+ORTHOGONAL_DIRECTIONS: tuple[int, ...] = (EAST, SOUTH, WEST, NORTH)
+ALL_DIRECTIONS: tuple[int, ...] = (EAST, SOUTH_EAST, SOUTH, SOUTH_WEST, WEST, NORTH_WEST, NORTH, NORTH_EAST)
+# label recorded against flat indices which are not cells (border, line endings)
+UNLABELLED: int = -1
+# a run of one repeated byte within a row
+RUN_PATTERN = re.compile(rb'(.)\1*', re.DOTALL)
+# serialised journals start with this, followed by the number of entries and the number of steps, then the layout of
+# the grid the journal was recorded against (rows, columns, offset and stride)
+JOURNAL_MAGIC: bytes = b'GJ02'
+JOURNAL_HEADER = struct.Struct('<4sqqqqqq')
+
+
+class SparseCells(dict):
+    """Flat index -> byte, holding only those cells which differ from the default; anything else reads as the default"""
+
+    def __init__(self, default: int):
+        super().__init__()
+        self.default: int = default
+
+    def __missing__(self, index: int) -> int:
+        return self.default
+
+
+@dataclass
+class Region:
+    """A connected (4-connected) group of cells all holding the same value"""
+    label: int
+    value: str
+    area: int
+    perimeter: int
+    # bounding box, inclusive
+    top_left: Position
+    bottom_right: Position
+
+
+class Journal:
+    """Every cell change made to a grid, as (flat index, old byte, new byte), grouped into steps
+
+    Three flat buffers rather than a list of tuples, so that a million step run costs ten bytes a change. The
+    entries of a step are those recorded since the previous call to mark().
+
+    Indices are flat indices into the grid the journal was recorded against, so its extent, offset and stride are
+    kept alongside; replaying onto a grid laid out differently (padded, sparse, straight out of a file) goes by row
+    and column instead.
+    """
+    def __init__(self, extent: Position, offset: int, stride: int) -> None:
+        self.extent = extent
+        self.offset = offset
+        self.stride = stride
+        self.indices: array = array('q')
+        self.old: bytearray = bytearray()
+        self.new: bytearray = bytearray()
+        # number of entries recorded by the end of each step
+        self.steps: array = array('q')
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def record(self, index: int, old: int, new: int) -> None:
+        self.indices.append(index)
+        self.old.append(old)
+        self.new.append(new)
+
+    def mark(self) -> int:
+        """Close the current step; returns the number of steps now completed"""
+        self.steps.append(len(self.indices))
+        result: int = len(self.steps)
+        return result
+
+    def entries_at(self, step: int) -> int:
+        """Number of entries recorded by the end of the specified step (step 0 being before anything changed)"""
+        if not 0 <= step <= len(self.steps):
+            raise Exception(f'Step {step} is not in the journal, which holds {len(self.steps)} steps')
+        result: int = 0 if step == 0 else self.steps[step - 1]
+        return result
+
+    def truncate(self, step: int) -> None:
+        """Forget everything after the specified step"""
+        entries: int = self.entries_at(step=step)
+        del self.indices[entries:]
+        del self.old[entries:]
+        del self.new[entries:]
+        del self.steps[step:]
+
+    def to_bytes(self) -> bytes:
+        """Little endian, whatever the machine"""
+        header: bytes = JOURNAL_HEADER.pack(JOURNAL_MAGIC, len(self.indices), len(self.steps), self.extent.row, self.extent.column,
+                                            self.offset, self.stride)
+        indices: array = self.indices
+        steps: array = self.steps
+        if sys.byteorder != 'little':
+            indices = array(indices.typecode, indices)
+            indices.byteswap()
+            steps = array(steps.typecode, steps)
+            steps.byteswap()
+        result: bytes = b''.join([header, indices.tobytes(), steps.tobytes(), bytes(self.old), bytes(self.new)])
+        return result
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Journal':
+        magic: bytes = bytes(data[:len(JOURNAL_MAGIC)])
+        if magic != JOURNAL_MAGIC:
+            raise Exception(f'Expected a grid journal, but the data starts {magic!r}')
+        magic, entries, steps, rows, columns, offset, stride = JOURNAL_HEADER.unpack_from(data)
+        result: Journal = Journal(extent=Position(rows, columns), offset=offset, stride=stride)
+        start: int = JOURNAL_HEADER.size
+        result.indices.frombytes(data[start:start + entries * result.indices.itemsize])
+        start += entries * result.indices.itemsize
+        result.steps.frombytes(data[start:start + steps * result.steps.itemsize])
+        start += steps * result.steps.itemsize
+        result.old[:] = data[start:start + entries]
+        result.new[:] = data[start + entries:start + 2 * entries]
+        if sys.byteorder != 'little':
+            result.indices.byteswap()
+            result.steps.byteswap()
+        return result
 
 
 @dataclass
 class Grid:
     extent: Position
-    karte: dict[Position, str]|None = None
+    # the cells, row after row, in one contiguous buffer; cell (row, column) lives at offset + row * stride + column.
+    # dense grids we build ourselves are padded with a border of SENTINEL cells (so stride is the width + 2 and
+    # offset skips the top border row and left border cell); buffers straight out of a file have no border, but
+    # still carry their line endings. For sparse grids, cells is a SparseCells dictionary keyed on that same index.
+    cells: bytearray|mmap|SparseCells = field(default=None, repr=False)
+    stride: int = 0
+    offset: int = 0
+    sparse: bool = False
+    padded: bool = False
+    # flat index delta for a step in each direction; indexed by direction
+    direction_offsets: list[int] = field(default=None, repr=False, compare=False)
+    # (direction, flat index delta) of the 4-connected neighbours [False] and 8-connected neighbours [True]
+    neighbour_deltas: tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]] = field(default=None, repr=False, compare=False)
+    # byte -> flat indices of the cells holding it; each symbol is indexed the first time it is searched for
+    # and from then on kept up to date by set_value()
+    symbols: dict[int, set[int]] = field(default=None, repr=False, compare=False)
+    # rendered text of each row (None until rendered, or once set_value() has touched that row)
+    rendered_rows: list[str|None] = field(default=None, repr=False, compare=False)
+    # every change made by set_value(), while journalling
+    journal: Journal|None = field(default=None, repr=False, compare=False)
 
-    def __init__(self, extent: Position) -> None:
+    def __init__(self, extent: Position, fill: str = EMPTY, cells: bytearray|mmap|SparseCells|None = None, sparse: bool = False, stride: int|None = None, offset: int = 0, padded: bool = False) -> None:
         self.extent = extent
-        self.karte = {}
-        for row_index in range(self.extent.row):
-            for column_index in range(self.extent.column):
-                cursor = Position(row=row_index, column=column_index)
-                self.karte[cursor] = '.'
+        self.stride = extent.column if stride is None else stride
+        self.offset = offset
+        self.sparse = sparse
+        self.padded = padded
+        if cells is None:
+            if sparse:
+                cells = SparseCells(default=ord(Grid.encode(value=fill)))
+            else:
+                cells = Grid.pad(rows=[Grid.encode(value=fill) * extent.column] * extent.row, width=extent.column)
+                self.stride = extent.column + 2
+                self.offset = self.stride + 1
+                self.padded = True
+        elif not sparse and extent.row > 0 and len(cells) < self.offset + (extent.row - 1) * self.stride + extent.column:
+            raise Exception(f'Expected at least {self.offset + (extent.row - 1) * self.stride + extent.column} bytes for a grid of extent {extent}, but received {len(cells)}')
+        self.cells = cells
+        self.direction_offsets = [STEP_DIRECTIONS_BY_DIRECTION[d].row * self.stride + STEP_DIRECTIONS_BY_DIRECTION[d].column for d in range(len(ALL_DIRECTIONS))]
+        self.neighbour_deltas = (
+            tuple((d, self.direction_offsets[d]) for d in ORTHOGONAL_DIRECTIONS),
+            tuple((d, self.direction_offsets[d]) for d in ALL_DIRECTIONS)
+        )
+        self.symbols = {}
+        self.rendered_rows = [None] * extent.row
+        self.journal = None
 
     def __str__(self) -> str:
-        result: str = ''
+        rendered_rows: list[str|None] = self.rendered_rows
         for row_index in range(self.extent.row):
-            for column_index in range(self.extent.column):
-                result += self.karte.get(Position(row=row_index, column=column_index), None)
-            result += '\n'
+            if rendered_rows[row_index] is None:
+                self.render_row(row=row_index)
+        result: str = '\n'.join(rendered_rows) + '\n' if self.extent.row > 0 else ''
+        return result
+
+    @staticmethod
+    def encode(value: str) -> bytes:
+        if not isinstance(value, str) or len(value) != 1:
+            raise Exception(f'Expected a single character but received {value!r}')
+        result: bytes = value.encode('latin-1')
+        if result[0] == SENTINEL:
+            raise Exception(f'{value!r} is reserved for the border of the grid')
+        return result
+
+    @staticmethod
+    def pad(rows: Iterable[bytes], width: int) -> bytearray:
+        """Surround equal width rows with a one cell border of SENTINEL and pack them into a single buffer"""
+        border: bytes = bytes((SENTINEL,))
+        edge: bytes = border * (width + 2)
+        result: bytearray = bytearray(edge + border + (border * 2).join(rows) + border + edge)
         return result
 
     @classmethod
-    def from_lines(cls, lines: list[str]) -> 'Grid':
+    def from_lines(cls, lines: list[str], sparse: bool = False, fill: str = EMPTY) -> 'Grid':
+        """Build a grid from equal length lines of text
+
+        When sparse, only the cells which differ from fill are stored, so memory scales with the number of
+        occupied cells rather than with the extent.
+        """
         column_count: int = None
         # check that all lines are the same length....
         for line in lines:
@@ -38,17 +230,69 @@ class Grid:
                 if len(line) != column_count:
                     raise Exception(f'Expected all lines to be the same length, but received {len(line)} for line {line}')
 
-        result = Grid(extent=Position(row=len(lines), column=column_count))
-        for row_index in range(len(lines)):
-            row: str = lines[row_index]
-            for column_index in range(len(row)):
-                position: Position = Position(row=row_index, column=column_index)
-                value: str = row[column_index:column_index+1]
-                result.set_value(position=position, value=value)
+        extent: Position = Position(row=len(lines), column=column_count or 0)
+        if sparse:
+            result = Grid(extent=extent, fill=fill, sparse=True)
+            # let the regex engine skip over the (many) empty cells
+            occupied: re.Pattern = re.compile(f'[^{re.escape(fill)}]')
+            for row_index, line in enumerate(lines):
+                start: int = row_index * extent.column
+                for match in occupied.finditer(line):
+                    result.cells[start + match.start()] = ord(Grid.encode(value=match.group()))
+            return result
 
+        # one copy of each line straight into the buffer; no per-cell work at all
+        cells: bytearray = Grid.pad(rows=(line.encode('latin-1') for line in lines), width=extent.column)
+        result = Grid(extent=extent, cells=cells, stride=extent.column + 2, offset=extent.column + 3, padded=True)
         return result
 
 
+    @classmethod
+    def from_bytes(cls, data: bytes|bytearray|memoryview|mmap) -> 'Grid':
+        """Treat the raw contents of a map file as a grid, in place
+
+        Rows are read straight out of the buffer using the line length (including its newline) as the stride,
+        so nothing is allocated per cell. Writable buffers (bytearray, mmap) are used as-is; bytes and memoryviews
+        are copied once into a bytearray, so that set_value() still works and find() is there to search with.
+        Trailing line endings (blank lines at the end of the file) are ignored. Only the overall length is checked
+        against the first line ... we deliberately do not visit every row, so that a memory-mapped file only pages
+        in what is actually looked at.
+        """
+        if isinstance(data, (bytes, memoryview)):
+            data = bytearray(data)
+        length: int = len(data)
+        while length > 0 and data[length - 1] in b'\r\n':
+            length -= 1
+        newline_pos: int = data.find(b'\n', 0, length)
+        if newline_pos < 0:
+            # a single row without any line ending (or nothing at all)
+            return Grid(extent=Position(row=1 if length > 0 else 0, column=length), cells=data, stride=length)
+
+        newline_length: int = 1
+        if newline_pos > 0 and data[newline_pos - 1:newline_pos] == b'\r':
+            newline_length = 2
+        number_columns: int = newline_pos + 1 - newline_length
+        stride: int = newline_pos + 1
+        # (the last line has lost its line ending, if it ever had one)
+        number_rows: int = (length + newline_length) // stride
+        if number_rows * stride != length + newline_length:
+            raise Exception(f'Expected all lines to be {number_columns} wide, but {length} bytes is not a whole number of lines')
+        result: Grid = Grid(extent=Position(row=number_rows, column=number_columns), cells=data, stride=stride)
+        return result
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Grid':
+        """Memory-map the specified map file and treat it as a grid (see from_bytes)
+
+        The mapping is copy-on-write; set_value() alters our private copy of the page, never the file itself.
+        """
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return Grid.from_bytes(data=bytearray())
+            mapped: mmap = mmap(file.fileno(), 0, access=ACCESS_COPY)
+        result: Grid = Grid.from_bytes(data=mapped)
+        return result
+
     def is_valid_position(self, position: tuple[int, int]|Position) -> bool:
         p: Position = Position.as_position(candidate=position)
         row: int = p.row
@@ -56,24 +300,168 @@ class Grid:
         result: bool = 0 <= row < self.extent.row and 0 <= column < self.extent.column
         return result
 
-    def get_value(self, position: Position|tuple[int,int]) -> str:
+    def get_value(self, position: Position|tuple[int,int]) -> str|None:
         p: Position = Position.as_position(candidate=position)
-        result: str =  self.karte.get(p, None)
+        row: int = p.row
+        column: int = p.column
+        if not (0 <= row < self.extent.row and 0 <= column < self.extent.column):
+            return None
+        result: str = CHARACTERS[self.cells[self.offset + row * self.stride + column]]
         return result
 
-    def get_adjacent_value(self, position: Position|tuple[int,int], direction: int) -> str:
+    def get_adjacent_value(self, position: Position|tuple[int,int], direction: int) -> str|None:
         if isinstance(position, tuple) and (isinstance(position[0], int) or isinstance(position[0], float)) and (isinstance(position[1], int) or isinstance(position[1], float)):
             row: int = int(position[0])
             column: int = int(position[1])
             position = Position(row=row, column=column)
+        if self.padded and 0 <= position.row < self.extent.row and 0 <= position.column < self.extent.column:
+            # one step from inside the grid can at worst land upon the border
+            khar: int = self.cells[self.offset + position.row * self.stride + position.column + self.direction_offsets[direction]]
+            return CHARACTERS[khar] if khar != SENTINEL else None
         adjacent_position: Position = position.add(STEP_DIRECTIONS_BY_DIRECTION[direction])
-        result: str =  self.karte.get(adjacent_position, None)
+        result: str|None = self.get_value(adjacent_position)
         return result
 
-    def set_value(self, position: Position, value: str):
-        self.karte[position] = value
+    def index_of(self, position: Position|tuple[int,int]) -> int:
+        """Flat index of the specified (in bounds) position within cells"""
+        p: Position = Position.as_position(candidate=position)
+        if not (0 <= p.row < self.extent.row and 0 <= p.column < self.extent.column):
+            raise Exception(f'Position {p} lies outside of the grid extent {self.extent}')
+        result: int = self.offset + p.row * self.stride + p.column
+        return result
+
+    def position_of(self, index: int) -> Position:
+        row, column = divmod(index - self.offset, self.stride)
+        result: Position = Position.at(row, column)
+        return result
+
+    def neighbour_offsets(self, diagonal: bool = False) -> tuple[tuple[int, int], ...]:
+        """(direction, flat index delta) for each neighbour; 4-connected, or 8-connected when diagonal"""
+        result: tuple[tuple[int, int], ...] = self.neighbour_deltas[diagonal]
+        return result
+
+    def neighbour_indices(self, index: int, diagonal: bool = False) -> Iterator[tuple[int, int]]:
+        """(direction, flat index) of each neighbour of the cell at index that lies within the grid
+
+        On a padded grid this is nothing more than an addition and a sentinel test per neighbour.
+        """
+        cells: bytearray|mmap|SparseCells = self.cells
+        if self.padded:
+            for direction, delta in self.neighbour_deltas[diagonal]:
+                neighbour: int = index + delta
+                if cells[neighbour] != SENTINEL:
+                    yield direction, neighbour
+            return
+
+        # no border to fall back upon ... so we have to check the bounds
+        row, column = divmod(index - self.offset, self.stride)
+        for direction, delta in self.neighbour_deltas[diagonal]:
+            step: Position = STEP_DIRECTIONS_BY_DIRECTION[direction]
+            if 0 <= row + step.row < self.extent.row and 0 <= column + step.column < self.extent.column:
+                yield direction, index + delta
+
+    def neighbours(self, position: Position|tuple[int,int], diagonal: bool = False) -> Iterator[tuple[int, Position, str]]:
+        """(direction, position, value) of each neighbour of the specified position that lies within the grid"""
+        cells: bytearray|mmap|SparseCells = self.cells
+        for direction, neighbour in self.neighbour_indices(index=self.index_of(position=position), diagonal=diagonal):
+            yield direction, self.position_of(index=neighbour), CHARACTERS[cells[neighbour]]
+
+    def set_value(self, position: Position|tuple[int,int], value: str):
+        p: Position = Position.as_position(candidate=position)
+        row: int = p.row
+        column: int = p.column
+        if not (0 <= row < self.extent.row and 0 <= column < self.extent.column):
+            raise Exception(f'Position {p} lies outside of the grid extent {self.extent}')
+        index: int = self.offset + row * self.stride + column
+        self._store(index=index, row=row, khar=ord(Grid.encode(value=value)))
+        return
+
+    def _store(self, index: int, row: int, khar: int) -> None:
+        """Write one cell, keeping the row cache, symbol index and journal in step"""
+        self.rendered_rows[row] = None
+        previous: int = self.cells[index]
+        if self.journal is not None and previous != khar:
+            self.journal.record(index, previous, khar)
+        symbols: dict[int, set[int]] = self.symbols
+        if symbols:
+            if previous in symbols:
+                symbols[previous].discard(index)
+            if khar in symbols:
+                symbols[khar].add(index)
+        if self.sparse and khar == self.cells.default:
+            # back to the default ... so stop storing it
+            self.cells.pop(index, None)
+            return
+        self.cells[index] = khar
         return
 
+    def start_journal(self) -> Journal:
+        """Record every change from now on"""
+        self.journal = Journal(extent=self.extent, offset=self.offset, stride=self.stride)
+        return self.journal
+
+    def stop_journal(self) -> Journal|None:
+        result: Journal|None = self.journal
+        self.journal = None
+        return result
+
+    def rewind(self, step: int) -> None:
+        """Undo every change made after the specified (journalled) step; step 0 is the grid as the journal started"""
+        journal: Journal|None = self.journal
+        if journal is None:
+            raise Exception('Cannot rewind a grid which is not keeping a journal')
+        entries: int = journal.entries_at(step=step)
+        # don't journal the undoing
+        self.journal = None
+        try:
+            for i in range(len(journal) - 1, entries - 1, -1):
+                index: int = journal.indices[i]
+                self._store(index=index, row=(index - self.offset) // self.stride, khar=journal.old[i])
+        finally:
+            self.journal = journal
+        journal.truncate(step=step)
+
+    def replay(self, journal: Journal, step: int|None = None) -> None:
+        """Apply the changes of a journal (up to the end of the specified step, or all of them) to this grid
+
+        The journal must have been recorded against a grid of the same extent, but not necessarily the same layout.
+        """
+        if journal.extent != self.extent:
+            raise Exception(f'Cannot replay a journal recorded against a grid of extent {journal.extent} onto one of extent {self.extent}')
+        entries: int = len(journal) if step is None else journal.entries_at(step=step)
+        same_layout: bool = journal.offset == self.offset and journal.stride == self.stride
+        for i in range(entries):
+            row, column = divmod(journal.indices[i] - journal.offset, journal.stride)
+            index: int = journal.indices[i] if same_layout else self.offset + row * self.stride + column
+            self._store(index=index, row=row, khar=journal.new[i])
+
+    def row_bytes(self, row: int) -> bytes:
+        """Raw contents of the specified row"""
+        start: int = self.offset + row * self.stride
+        if self.sparse:
+            result: bytes = bytes(map(self.cells.__getitem__, range(start, start + self.extent.column)))
+        else:
+            result = bytes(self.cells[start:start + self.extent.column])
+        return result
+
+    def diff(self, other: 'Grid') -> list[tuple[Position, str, str]]:
+        """(position, our value, their value) of every cell that differs, in row then column order
+
+        Whole rows are compared first, so only rows which actually differ are walked cell by cell.
+        """
+        if self.extent != other.extent:
+            raise Exception(f'Cannot diff grids of different extents ({self.extent} and {other.extent})')
+        result: list[tuple[Position, str, str]] = []
+        for row in range(self.extent.row):
+            mine: bytes = self.row_bytes(row=row)
+            theirs: bytes = other.row_bytes(row=row)
+            if mine == theirs:
+                continue
+            for column in range(len(mine)):
+                if mine[column] != theirs[column]:
+                    result.append((Position.at(row, column), CHARACTERS[mine[column]], CHARACTERS[theirs[column]]))
+        return result
+
     def is_obstacle(self, position: Position) -> bool:
         result: bool
         result: bool = self.get_value(position) == '#'
@@ -85,58 +473,382 @@ class Grid:
         return result
 
     def number_rows(self) -> int:
-        result: int = self.extent[0]
+        result: int = self.extent.row
         return result
 
     def number_columns(self) -> int:
-        result: int = self.extent[1]
+        result: int = self.extent.column
         return result
 
     def get_extent(self) -> Position:
         result = self.extent
         return result
 
+    def index_space(self) -> int:
+        """Number of flat indices needed to address every cell (including any border or line endings)"""
+        result: int = self.offset + self.extent.row * self.stride if self.sparse else len(self.cells)
+        return result
+
     def find_value(self, value: str) -> list[Position]:
-        result: list[Position] = []
-        for position in self.karte.keys():
-            if self.karte.get(position) == value:
-                result.append(position)
+        """All positions holding value, in row then column order"""
+        target: int = ord(Grid.encode(value=value))
+        result: list[Position] = [self.position_of(index=index) for index in sorted(self._locate(target=target))]
+        return result
+
+    def count_value(self, value: str) -> int:
+        result: int = len(self._locate(target=ord(Grid.encode(value=value))))
+        return result
+
+    def _locate(self, target: int) -> set[int]:
+        """Flat indices of every cell holding target (see symbols)"""
+        result: set[int]|None = self.symbols.get(target)
+        if result is not None:
+            return result
+
+        if self.sparse:
+            if target == self.cells.default:
+                # every cell that is NOT stored ... not something we want to keep an index of.
+                return set(i for i in range(self.extent.row * self.extent.column) if i not in self.cells)
+            result = set(i for i, khar in self.cells.items() if khar == target)
+        else:
+            # let find() do the scanning ... it runs at C speed
+            result = set()
+            needle: bytes = bytes((target,))
+            index: int = self.cells.find(needle)
+            while index >= 0:
+                row, column = divmod(index - self.offset, self.stride)
+                # skip over any line endings (or border) that are still in the buffer
+                if 0 <= row < self.extent.row and column < self.extent.column:
+                    result.add(index)
+                index = self.cells.find(needle, index + 1)
+        self.symbols[target] = result
         return result
 
     def render_row(self, row: int) -> str:
-        result: str = ''
-        for column_index in range(self.extent.column):
-            khar: str = self.get_value(position=(row, column_index)) or '.'
-            result += khar
+        """Text of the specified row (without line ending); cached until set_value() next touches the row"""
+        if not 0 <= row < self.extent.row:
+            raise Exception(f'Row {row} lies outside of the grid extent {self.extent}')
+        result: str|None = self.rendered_rows[row]
+        if result is not None:
+            return result
+        result = self.row_bytes(row=row).decode('latin-1')
+        self.rendered_rows[row] = result
+        return result
+
+    def label_regions(self) -> tuple[array, list[Region]]:
+        """Label every connected region of identical cells in a single sweep
+
+        Returns a label for each flat index (UNLABELLED for anything that is not a cell) and a Region, holding the
+        area, perimeter and bounding box, for each label. Each row is broken into runs of one repeated value; runs
+        touching a run of the same value in the row above are joined by union-find, so the work is linear in the
+        number of runs rather than a (recursive) walk out from every cell.
+        """
+        # per run ... (start index, length, row, start column, provisional label)
+        runs: list[tuple[int, int, int, int, int]] = []
+        run_values: list[int] = []
+        parent: list[int] = []
+        # per provisional label; the number of (horizontal and vertical) adjacencies between cells of the label
+        adjacencies: list[int] = []
+
+        def find(label: int) -> int:
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        previous_row: list[tuple[int, int, int, int]] = []
+        for row in range(self.extent.row):
+            start: int = self.offset + row * self.stride
+            text: bytes = self.row_bytes(row=row)
+            current_row: list[tuple[int, int, int, int]] = []
+            above: int = 0
+            above_count: int = len(previous_row)
+            for match in RUN_PATTERN.finditer(text):
+                first: int = match.start()
+                last: int = match.end()
+                value: int = text[first]
+                label: int = len(parent)
+                parent.append(label)
+                adjacencies.append(last - first - 1)
+                # walk the runs of the row above that overlap this one
+                while above < above_count and previous_row[above][1] <= first:
+                    above += 1
+                probe: int = above
+                while probe < above_count and previous_row[probe][0] < last:
+                    above_first, above_last, above_value, above_label = previous_row[probe]
+                    if above_value == value:
+                        overlap: int = (last if last < above_last else above_last) - (first if first > above_first else above_first)
+                        root: int = find(above_label)
+                        mine: int = find(label)
+                        if root != mine:
+                            parent[mine] = root
+                            adjacencies[root] += adjacencies[mine]
+                        adjacencies[root] += overlap
+                    probe += 1
+                runs.append((start + first, last - first, row, first, label))
+                run_values.append(value)
+                current_row.append((first, last, value, label))
+            previous_row = current_row
+
+        # number the surviving roots in reading order and gather their statistics
+        labels: array = array('q', [UNLABELLED]) * self.index_space()
+        final_labels: dict[int, int] = {}
+        regions: list[Region] = []
+        areas: list[int] = []
+        boxes: list[list[int]] = []
+        for (index, length, row, column, label), value in zip(runs, run_values):
+            root: int = find(label)
+            final: int|None = final_labels.get(root)
+            if final is None:
+                final = len(regions)
+                final_labels[root] = final
+                regions.append(Region(label=final, value=CHARACTERS[value], area=0, perimeter=0, top_left=None, bottom_right=None))
+                areas.append(0)
+                boxes.append([row, column, row, column + length - 1])
+            else:
+                box: list[int] = boxes[final]
+                box[1] = min(box[1], column)
+                box[2] = row
+                box[3] = max(box[3], column + length - 1)
+            areas[final] += length
+            labels[index:index + length] = array('q', [final]) * length
+        for root, final in final_labels.items():
+            region: Region = regions[final]
+            region.area = areas[final]
+            # every cell brings four sides, and every adjacency hides two of them
+            region.perimeter = 4 * region.area - 2 * adjacencies[root]
+            box = boxes[final]
+            region.top_left = Position.at(box[0], box[1])
+            region.bottom_right = Position.at(box[2], box[3])
+        return labels, regions
+
+    def view(self) -> 'GridView':
+        """The whole grid, as a view onto the same buffer"""
+        result: GridView = GridView(grid=self, origin=self.offset, extent=self.extent, row_step=self.stride, column_step=1)
+        return result
+
+    def transpose(self) -> 'GridView':
+        return self.view().transpose()
+
+    def rotate(self, quarter_turns: int = 1) -> 'GridView':
+        return self.view().rotate(quarter_turns=quarter_turns)
+
+    def window(self, top_left: Position|tuple[int, int], extent: Position|tuple[int, int]) -> 'GridView':
+        return self.view().window(top_left=top_left, extent=extent)
+
+
+class GridView:
+    """A rectangular view onto a grid's cells, without copying them
+
+    View cell (row, column) is the grid cell at flat index origin + row * row_step + column * column_step; transposing,
+    rotating or windowing a view simply produces another origin and pair of steps. Rows, columns and diagonals of a
+    dense grid come back as (strided) memoryview slices of the grid buffer, so that they can be scanned as ordinary
+    byte sequences; a sparse grid has no buffer to slice, so its lines are gathered cell by cell instead.
+    """
+    def __init__(self, grid: Grid, origin: int, extent: Position, row_step: int, column_step: int) -> None:
+        self.grid = grid
+        self.origin = origin
+        self.extent = extent
+        self.row_step = row_step
+        self.column_step = column_step
+        self.buffer: memoryview|None = None if grid.sparse else memoryview(grid.cells)
+
+    def __str__(self) -> str:
+        result: str = ''.join(bytes(self.row(row=r)).decode('latin-1') + '\n' for r in range(self.extent.row))
         return result
 
+    def index_of(self, position: Position|tuple[int, int]) -> int:
+        p: Position = Position.as_position(candidate=position)
+        if not (0 <= p.row < self.extent.row and 0 <= p.column < self.extent.column):
+            raise Exception(f'Position {p} lies outside of the view extent {self.extent}')
+        result: int = self.origin + p.row * self.row_step + p.column * self.column_step
+        return result
+
+    def get_value(self, position: Position|tuple[int, int]) -> str|None:
+        p: Position = Position.as_position(candidate=position)
+        if not (0 <= p.row < self.extent.row and 0 <= p.column < self.extent.column):
+            return None
+        result: str = CHARACTERS[self.grid.cells[self.origin + p.row * self.row_step + p.column * self.column_step]]
+        return result
+
+    def line(self, start: int, step: int, length: int) -> memoryview|bytes:
+        """length cells from flat index start, step apart"""
+        if length <= 0:
+            return b''
+        if length == 1:
+            # a lone cell has no step to speak of ... and on a grid one cell wide, an anti-diagonal step comes out as 0
+            step = 1
+        if self.buffer is None:
+            cells: SparseCells = self.grid.cells
+            return bytes(cells[start + i * step] for i in range(length))
+        stop: int|None = start + length * step
+        if stop < 0:
+            # slicing backwards all the way to the start of the buffer
+            stop = None
+        result: memoryview = self.buffer[start:stop:step]
+        return result
+
+    def row(self, row: int) -> memoryview|bytes:
+        result: memoryview|bytes = self.line(start=self.origin + row * self.row_step, step=self.column_step, length=self.extent.column)
+        return result
+
+    def column(self, column: int) -> memoryview|bytes:
+        result: memoryview|bytes = self.line(start=self.origin + column * self.column_step, step=self.row_step, length=self.extent.row)
+        return result
+
+    def rows(self) -> Iterator[memoryview|bytes]:
+        for r in range(self.extent.row):
+            yield self.row(row=r)
+
+    def columns(self) -> Iterator[memoryview|bytes]:
+        for c in range(self.extent.column):
+            yield self.column(column=c)
+
+    def diagonals(self) -> Iterator[memoryview|bytes]:
+        """Every line running south east, starting from the top right corner and ending at the bottom left"""
+        rows: int = self.extent.row
+        columns: int = self.extent.column
+        step: int = self.row_step + self.column_step
+        for c in range(columns - 1, -1, -1):
+            yield self.line(start=self.origin + c * self.column_step, step=step, length=min(rows, columns - c))
+        for r in range(1, rows):
+            yield self.line(start=self.origin + r * self.row_step, step=step, length=min(rows - r, columns))
+
+    def anti_diagonals(self) -> Iterator[memoryview|bytes]:
+        """Every line running south west, starting from the top left corner and ending at the bottom right"""
+        rows: int = self.extent.row
+        columns: int = self.extent.column
+        step: int = self.row_step - self.column_step
+        for c in range(columns):
+            yield self.line(start=self.origin + c * self.column_step, step=step, length=min(rows, c + 1))
+        last: int = (columns - 1) * self.column_step
+        for r in range(1, rows):
+            yield self.line(start=self.origin + r * self.row_step + last, step=step, length=min(rows - r, columns))
+
+    def lines(self, direction: int) -> Iterator[memoryview|bytes]:
+        """Every line of the view read in the specified direction"""
+        if direction == EAST:
+            return self.rows()
+        if direction == SOUTH:
+            return self.columns()
+        if direction == SOUTH_EAST:
+            return self.diagonals()
+        if direction == SOUTH_WEST:
+            return self.anti_diagonals()
+        # the remaining directions are those same lines, read backwards
+        return self.rotate(quarter_turns=2).lines(direction=direction - 4)
+
+    def transpose(self) -> 'GridView':
+        result: GridView = GridView(grid=self.grid, origin=self.origin, extent=Position.at(self.extent.column, self.extent.row),
+                                    row_step=self.column_step, column_step=self.row_step)
+        return result
+
+    def rotate(self, quarter_turns: int = 1) -> 'GridView':
+        """The view turned clockwise by the specified number of quarter turns (negative for anti-clockwise)"""
+        rows: int = self.extent.row
+        columns: int = self.extent.column
+        turns: int = quarter_turns % 4
+        if turns == 0:
+            return self
+        if turns == 1:
+            # the new rows are our columns, read from the bottom up
+            return GridView(grid=self.grid, origin=self.origin + (rows - 1) * self.row_step, extent=Position.at(columns, rows),
+                            row_step=self.column_step, column_step=-self.row_step)
+        if turns == 2:
+            return GridView(grid=self.grid, origin=self.origin + (rows - 1) * self.row_step + (columns - 1) * self.column_step,
+                            extent=self.extent, row_step=-self.row_step, column_step=-self.column_step)
+        # the new rows are our columns, right to left, read from the top down
+        return GridView(grid=self.grid, origin=self.origin + (columns - 1) * self.column_step, extent=Position.at(columns, rows),
+                        row_step=-self.column_step, column_step=self.row_step)
+
+    def window(self, top_left: Position|tuple[int, int], extent: Position|tuple[int, int]) -> 'GridView':
+        corner: Position = Position.as_position(candidate=top_left)
+        size: Position = Position.as_position(candidate=extent)
+        if corner.row < 0 or corner.column < 0 or size.row < 0 or size.column < 0 or \
+                corner.row + size.row > self.extent.row or corner.column + size.column > self.extent.column:
+            raise Exception(f'Window of {size} at {corner} does not fit within the view extent {self.extent}')
+        result: GridView = GridView(grid=self.grid, origin=self.origin + corner.row * self.row_step + corner.column * self.column_step,
+                                    extent=size, row_step=self.row_step, column_step=self.column_step)
+        return result
+
+
 class BreadCrumbs:
-    trail: dict[Position, Set[int]] = {}
+    """Which directions each cell of a grid has been travelled in
+
+    One byte per flat cell index, bit d set once we have left (or entered) the cell heading in direction d. Snapshots
+    share the buffer with their parent; whichever of the two writes first takes a private copy (copy on write), so a
+    loop-detection search can fork a trail at every junction for the price of a flag.
+    """
+    def __init__(self, grid: Grid, masks: bytearray|None = None, holders: list[int]|None = None) -> None:
+        self.grid = grid
+        self.masks = bytearray(grid.index_space()) if masks is None else masks
+        # how many trails hold masks ... one list, shared by all of them, so that each sees the others come and go
+        self.holders = [1] if holders is None else holders
+
+    def __del__(self) -> None:
+        self.holders[0] -= 1
+
+    @property
+    def shared(self) -> bool:
+        """True while some other trail holds the same buffer"""
+        return self.holders[0] > 1
+
+    def _release(self) -> None:
+        """Stop holding the shared buffer, before this trail takes a buffer of its own"""
+        self.holders[0] -= 1
+        self.holders = [1]
+
+    def _writable(self) -> bytearray:
+        if self.holders[0] > 1:
+            self._release()
+            self.masks = bytearray(self.masks)
+        return self.masks
 
     def add(self, position: Position|tuple[int, int], direction: int) -> None:
-        if position not in self.trail:
-            self.trail[position] = set(direction)
-        else:
-            self.trail[position].add(direction)
+        self.add_index(index=self.grid.index_of(position=position), direction=direction)
 
-    def already_travelled(self, position: Position, direction: int|None = None) -> bool:
-        result: bool = False
-        if position not in self.trail:
-            return result
-        if direction is None:
-            result = len(self.trail.get(position)) > 0
-        else:
-            result = direction in self.trail.get(position)
+    def add_index(self, index: int, direction: int) -> None:
+        masks: bytearray = self.masks if self.holders[0] == 1 else self._writable()
+        masks[index] |= 1 << direction
+
+    def already_travelled(self, position: Position|tuple[int, int], direction: int|None = None) -> bool:
+        result: bool = self.already_travelled_index(index=self.grid.index_of(position=position), direction=direction)
         return result
 
+    def already_travelled_index(self, index: int, direction: int|None = None) -> bool:
+        mask: int = self.masks[index]
+        result: bool = mask != 0 if direction is None else (mask >> direction) & 1 == 1
+        return result
+
+    def snapshot(self) -> 'BreadCrumbs':
+        """A copy of the trail that costs nothing until either copy is written to"""
+        self.holders[0] += 1
+        result: BreadCrumbs = BreadCrumbs(grid=self.grid, masks=self.masks, holders=self.holders)
+        return result
+
+    def merge(self, other: 'BreadCrumbs') -> None:
+        """Add every direction travelled in other to this trail (in place)"""
+        if len(other.masks) != len(self.masks):
+            raise Exception(f'Cannot merge trails over grids of different sizes ({len(self.masks)} and {len(other.masks)} cells)')
+        # or the two buffers together as a pair of (very) big integers rather than byte by byte
+        combined: int = int.from_bytes(self.masks, 'little') | int.from_bytes(other.masks, 'little')
+        self._release()
+        self.masks = bytearray(combined.to_bytes(len(self.masks), 'little'))
+
     def append(self, other: 'BreadCrumbs') -> 'BreadCrumbs':
-        result: BreadCrumbs = BreadCrumbs()
-        for position in self.trail.keys():
-            for direction in self.trail.get(position):
-                result.add(position, direction)
-        for position in other.trail.keys():
-            for direction in other.trail.get(position):
-                result.add(position, direction)
+        result: BreadCrumbs = self.snapshot()
+        result.merge(other=other)
+        return result
+
+    def travelled(self) -> list[Position]:
+        """Every position travelled through, in row then column order"""
+        position_of = self.grid.position_of
+        result: list[Position] = [position_of(index=i) for i, mask in enumerate(self.masks) if mask]
+        return result
+
+    def count(self) -> int:
+        """Number of cells travelled through"""
+        result: int = len(self.masks) - self.masks.count(0)
         return result
 
 def test():
@@ -183,6 +895,22 @@ def test():
     assert(Position.as_position((' ( x=3.0 , y=4.0 ) ')) == Position(4, 3))
     assert(Position.as_position((4 ,3)) == Position(4, 3))
     assert(Position.as_position((4 ,3.0001)) == Position(4, 3))
+    assert(Position(row='4', column=3.0) == Position(4, 3))
+
+    # interned positions are shared rather than allocated afresh
+    Position.intern(extent=(15, 15))
+    assert(Position(3, 1).add(Position(0, 1)) is Position(3, 3).subtract(Position(0, 1)))
+    assert(Position(14, 14).add(Position(0, 1)) is not Position(14, 14).add(Position(0, 1)))
+    Position.intern(extent=None)
+
+    # batch arithmetic; step a handful of positions east, then discard those that fell off a 4x4 grid
+    rows, columns = arrays_from_positions(positions=[(0, 0), (1, 3), (3, 2)], typecode='i')
+    rows, columns = step_positions(rows=rows, columns=columns, direction=EAST)
+    assert(list(columns) == [1, 4, 3])
+    mask = positions_within_bounds(rows=rows, columns=columns, extent=(4, 4))
+    assert(list(mask) == [1, 0, 1])
+    rows, columns = select_positions(rows=rows, columns=columns, mask=mask)
+    assert(positions_from_arrays(rows=rows, columns=columns) == [Position(0, 1), Position(3, 3)])
 
     grid: Grid = Grid.from_lines(lines=sample_data)
     assert(grid.get_extent() == (15, 15))
@@ -196,6 +924,160 @@ def test():
     assert(grid.is_valid_position(position=(14, 14)))
     assert(grid.is_valid_position(position=(15, 14)) == False)
     assert(grid.is_valid_position(position=(14, 15)) == False)
+    assert(grid.get_value(position=(15, 0)) is None)
+    assert(grid.find_value(value='S') == [Position(3, 1)])
+    assert(grid.count_value(value='E') == 1)
+    assert(grid.count_value(value='O') == 0)
+    assert(str(grid) == '\n'.join(sample_data) + '\n')
+    grid.set_value(position=(3, 1), value='.')
+    grid.set_value(position=(13, 13), value='S')
+    assert(grid.find_value(value='S') == [Position(13, 13)])
+    grid.set_value(position=(1, 1), value='O')
+    grid.set_value(position=(1, 2), value='O')
+    assert(grid.find_value(value='O') == [Position(1, 1), Position(1, 2)])
+    grid.set_value(position=(1, 1), value='.')
+    assert(grid.count_value(value='O') == 1)
+    grid.set_value(position=(1, 2), value='.')
+    assert(grid.render_row(row=13) == '#...#...#...#S#')
+    assert(str(grid).split('\n')[13] == '#...#...#...#S#')
+
+    # the same maze held sparsely, storing only the walls and markers
+    sparse_grid: Grid = Grid.from_lines(lines=sample_data, sparse=True)
+    assert(len(sparse_grid.cells) == sum(len(line) - line.count('.') for line in sample_data))
+    assert(str(sparse_grid) == '\n'.join(sample_data) + '\n')
+    assert(sparse_grid.get_value(position=(1, 1)) == '.')
+    assert(sparse_grid.get_value(position=(7, 5)) == 'E')
+    assert(sparse_grid.get_value(position=(15, 0)) is None)
+    assert(sparse_grid.find_value(value='S') == [Position(3, 1)])
+    sparse_grid.set_value(position=(3, 1), value='.')
+    sparse_grid.set_value(position=(1, 1), value='S')
+    assert(sparse_grid.find_value(value='S') == [Position(1, 1)])
+    assert(len(sparse_grid.cells) == sum(len(line) - line.count('.') for line in sample_data))
+
+    # and straight out of the raw file contents, line endings and all
+    raw_grid: Grid = Grid.from_bytes(data=('\r\n'.join(sample_data)).encode())
+    assert(raw_grid.get_extent() == (15, 15))
+    assert(raw_grid.get_value(position=(3, 1)) == 'S')
+    assert(raw_grid.get_value(position=(3, 15)) is None)
+    assert(raw_grid.find_value(value='E') == [Position(7, 5)])
+    assert(str(raw_grid) == '\n'.join(sample_data) + '\n')
+    # memoryviews are copied, and trailing blank lines are ignored
+    for data in [memoryview(b'ab\ncd\n'), b'ab\ncd\n\n', b'ab\r\ncd\r\n\r\n', memoryview(bytearray(b'ab\ncd'))]:
+        raw: Grid = Grid.from_bytes(data=data)
+        assert(raw.get_extent() == (2, 2))
+        assert(str(raw) == str(Grid.from_lines(lines=['ab', 'cd'])))
+        raw.set_value(position=(1, 1), value='x')
+        assert(raw.find_value(value='x') == [Position(1, 1)])
+    for data in [b'', b'\n', b'\r\n\n']:
+        assert(Grid.from_bytes(data=data).get_extent() == (0, 0))
+    assert(Grid.from_bytes(data=b'abc\n').get_extent() == (1, 3))
+
+    # neighbours ... padded, unpadded and sparse grids should all agree
+    for g in [grid, sparse_grid, raw_grid]:
+        assert([(d, p) for d, p, v in g.neighbours(position=(0, 0))] == [(EAST, Position(0, 1)), (SOUTH, Position(1, 0))])
+        assert(len(list(g.neighbours(position=(0, 0), diagonal=True))) == 3)
+        assert(len(list(g.neighbours(position=(14, 7), diagonal=True))) == 5)
+        assert([v for d, p, v in g.neighbours(position=(7, 4))] == ['E', '#', '.', '#'])
+        assert(g.get_adjacent_value(position=(0, 0), direction=NORTH) is None)
+        assert(g.get_adjacent_value(position=(7, 4), direction=EAST) == 'E')
+
+    # bread crumbs belong to their own instance, and snapshots only copy once written to
+    crumbs: BreadCrumbs = BreadCrumbs(grid=grid)
+    crumbs.add(position=(3, 1), direction=NORTH)
+    assert(crumbs.already_travelled(position=(3, 1)))
+    assert(crumbs.already_travelled(position=(3, 1), direction=NORTH))
+    assert(not crumbs.already_travelled(position=(3, 1), direction=EAST))
+    assert(not BreadCrumbs(grid=grid).already_travelled(position=(3, 1)))
+    fork: BreadCrumbs = crumbs.snapshot()
+    assert(fork.masks is crumbs.masks)
+    fork.add(position=(2, 1), direction=NORTH)
+    assert(fork.already_travelled(position=(2, 1)))
+    assert(not crumbs.already_travelled(position=(2, 1)))
+    merged: BreadCrumbs = crumbs.append(other=fork)
+    assert(merged.travelled() == [Position(2, 1), Position(3, 1)])
+    assert(crumbs.count() == 1)
+    # the merge gave the appended trail a buffer of its own, so the parent no longer needs to copy when it writes
+    assert(not crumbs.shared and not merged.shared)
+    buffer: bytearray = crumbs.masks
+    crumbs.add(position=(4, 1), direction=NORTH)
+    assert(crumbs.masks is buffer)
+    # nor once a snapshot is thrown away
+    fork = crumbs.snapshot()
+    assert(crumbs.shared)
+    del fork
+    assert(not crumbs.shared)
+
+    # regions ... the small garden sample prices at 140 (area x perimeter)
+    garden: Grid = Grid.from_lines(lines=['AAAA', 'BBCD', 'BBCC', 'EEEC'])
+    labels, regions = garden.label_regions()
+    assert([r.value for r in regions] == ['A', 'B', 'C', 'D', 'E'])
+    assert(sum(r.area * r.perimeter for r in regions) == 140)
+    assert(regions[2].top_left == (1, 2) and regions[2].bottom_right == (3, 3))
+    assert(labels[garden.index_of(position=(3, 3))] == 2)
+    assert(labels[0] == UNLABELLED)
+    # a region that only joins up (around the U bend) once we reach the bottom row
+    labels, regions = Grid.from_lines(lines=['ABA', 'ABA', 'AAA'], sparse=True).label_regions()
+    assert([(r.value, r.area, r.perimeter) for r in regions] == [('A', 7, 16), ('B', 2, 6)])
+
+    # journalling ... rewind to any step, replay onto a copy, diff the two
+    original: Grid = Grid.from_lines(lines=sample_data)
+    journalled: Grid = Grid.from_lines(lines=sample_data)
+    journal: Journal = journalled.start_journal()
+    journalled.set_value(position=(3, 1), value='.')
+    journalled.set_value(position=(2, 1), value='S')
+    assert(journal.mark() == 1)
+    journalled.set_value(position=(2, 1), value='.')
+    journalled.set_value(position=(1, 1), value='S')
+    assert(journal.mark() == 2)
+    assert(len(journal) == 4)
+    assert(original.diff(other=journalled) == [(Position(1, 1), '.', 'S'), (Position(3, 1), 'S', '.')])
+    replayed: Grid = Grid.from_lines(lines=sample_data)
+    replayed.replay(journal=Journal.from_bytes(data=journal.to_bytes()), step=1)
+    assert(replayed.find_value(value='S') == [Position(2, 1)])
+    journalled.rewind(step=1)
+    assert(journalled.diff(other=replayed) == [])
+    assert(journalled.find_value(value='S') == [Position(2, 1)])
+    # replaying onto grids laid out differently (sparse, or straight out of a file) goes by row and column
+    for other in [Grid.from_lines(lines=sample_data, sparse=True), Grid.from_bytes(data='\n'.join(sample_data).encode())]:
+        other.replay(journal=Journal.from_bytes(data=journal.to_bytes()), step=1)
+        assert(other.diff(other=replayed) == [])
+    try:
+        Grid.from_lines(lines=['ab', 'cd']).replay(journal=journal)
+        assert(False)
+    except Exception as e:
+        assert('extent' in str(e))
+    journalled.rewind(step=0)
+    assert(journalled.diff(other=original) == [])
+    assert(len(journal) == 0)
+
+    # views share the buffer ... the word search sample has 18 XMAS, in every direction
+    word_search: list[str] = ['MMMSXXMASM', 'MSAMXMSMSA', 'AMXSXMAAMM', 'MSAMASMSMX', 'XMASAMXAMM', 'XXAMMXXAMA', 'SMSMSASXSS',
+                              'SAXAMASAAA', 'MAMMMXMMMM', 'MXMXAXMASX']
+    for g in [Grid.from_lines(lines=word_search), Grid.from_bytes(data='\n'.join(word_search).encode()), Grid.from_lines(lines=word_search, sparse=True)]:
+        view: GridView = g.view()
+        assert(sum(bytes(line).count(b'XMAS') for direction in ALL_DIRECTIONS for line in view.lines(direction=direction)) == 18)
+    small: Grid = Grid.from_lines(lines=['abc', 'def'])
+    assert(str(small.view()) == str(small))
+    assert(str(small.transpose()) == 'ad\nbe\ncf\n')
+    assert(str(small.rotate()) == 'da\neb\nfc\n')
+    assert(str(small.rotate(quarter_turns=2)) == 'fed\ncba\n')
+    assert(str(small.rotate(quarter_turns=-1)) == 'cf\nbe\nad\n')
+    assert(str(small.rotate().rotate().rotate().rotate()) == str(small))
+    assert(str(small.window(top_left=(0, 1), extent=(2, 2))) == 'bc\nef\n')
+    assert(bytes(small.rotate().window(top_left=(1, 0), extent=(2, 2)).column(column=1)) == b'bc')
+    assert([bytes(d) for d in small.view().diagonals()] == [b'c', b'bf', b'ae', b'd'])
+    assert([bytes(d) for d in small.view().anti_diagonals()] == [b'a', b'bd', b'ce', b'f'])
+    # one cell wide, straight out of a file (so no border to keep the anti-diagonal step from being 0)
+    single: GridView = Grid.from_bytes(data=b'a').view()
+    assert(all([bytes(line) for line in single.lines(direction=d)] == [b'a'] for d in ALL_DIRECTIONS))
+    column: GridView = Grid.from_bytes(data=b'a\nb\nc').view()
+    assert([bytes(d) for d in column.anti_diagonals()] == [b'a', b'b', b'c'])
+    assert([bytes(d) for d in column.rotate().anti_diagonals()] == [b'c', b'b', b'a'])
+    assert(small.rotate().get_value(position=(0, 0)) == 'd')
+    # the buffer really is shared
+    rotated: GridView = small.rotate()
+    small.set_value(position=(1, 0), value='X')
+    assert(rotated.get_value(position=(0, 0)) == 'X')
 
 
 def main(argv: list[str]):
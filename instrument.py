@@ -0,0 +1,250 @@
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Iterator
+
+# profilers profile() knows about
+CPROFILE: str = 'cprofile'
+SAMPLING: str = 'sampling'
+# seconds of CPU time between samples taken by the sampling profiler
+SAMPLE_INTERVAL: float = 0.001
+# number of lines a profile report is cut down to
+REPORT_LINES: int = 25
+
+
+@dataclass
+class Statistic:
+    calls: int = 0
+    # seconds spent within the outermost calls; time within recursive calls is not counted twice
+    elapsed: float = 0.0
+    # how deeply we are currently nested within calls (or spans) of this name
+    depth: int = 0
+
+
+# whether traced functions are currently being timed ... see enable()
+enabled: bool = False
+statistics: dict[str, Statistic] = {}
+counters: Counter = Counter()
+# every traced function, by name: (the function itself, its wrapper)
+traced_functions: dict[str, tuple[Callable, Callable]] = {}
+
+
+def statistic(name: str) -> Statistic:
+    result: Statistic|None = statistics.get(name)
+    if result is None:
+        result = statistics[name] = Statistic()
+    return result
+
+def timed(function: Callable, name: str) -> Callable:
+    record: Statistic = statistic(name=name)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        record.calls += 1
+        if record.depth:
+            # a recursive call ... the outermost one is already timing us
+            record.depth += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record.depth -= 1
+        record.depth = 1
+        start: float = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record.elapsed += perf_counter() - start
+            record.depth = 0
+    return wrapper
+
+def traced(function: Callable) -> Callable:
+    """Decorator registering a function (or method) whose calls and time are reported once instrumentation is enabled
+
+    The function is handed back untouched, so while instrumentation is disabled it costs nothing at all; enable()
+    swaps a timing wrapper into the function's module (or class) and disable() swaps the original back. Anything that
+    took its own reference to the function (from module import function) keeps calling the original.
+    """
+    name: str = f'{function.__module__}.{function.__qualname__}'
+    traced_functions[name] = (function, timed(function=function, name=name))
+    if enabled:
+        return traced_functions[name][1]
+    return function
+
+def owner_of(function: Callable) -> object|None:
+    """The module or class the function is an attribute of"""
+    result: object|None = sys.modules.get(function.__module__)
+    for part in function.__qualname__.split('.')[:-1]:
+        if result is None or part == '<locals>':
+            return None
+        result = getattr(result, part, None)
+    return result
+
+def swap(use_wrappers: bool) -> None:
+    for name, (function, wrapper) in traced_functions.items():
+        owner: object|None = owner_of(function=function)
+        if owner is not None:
+            setattr(owner, function.__name__, wrapper if use_wrappers else function)
+
+def enable() -> None:
+    global enabled
+    enabled = True
+    swap(use_wrappers=True)
+
+def disable() -> None:
+    global enabled
+    enabled = False
+    swap(use_wrappers=False)
+
+def reset() -> None:
+    for record in statistics.values():
+        record.calls = 0
+        record.elapsed = 0.0
+    counters.clear()
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a named counter (only while enabled); best kept out of the very hottest loops, as the call is not free"""
+    if enabled:
+        counters[name] += amount
+
+def span(name: str):
+    """Context manager timing a block of code under a name (a shared do-nothing context while disabled)"""
+    if not enabled:
+        return NULL_SPAN
+    return timed_span(name=name)
+
+NULL_SPAN = nullcontext()
+
+@contextmanager
+def timed_span(name: str) -> Iterator[Statistic]:
+    record: Statistic = statistic(name=name)
+    record.calls += 1
+    record.depth += 1
+    start: float = perf_counter()
+    try:
+        yield record
+    finally:
+        record.depth -= 1
+        if record.depth == 0:
+            record.elapsed += perf_counter() - start
+
+def report() -> str:
+    """Calls and cumulative time of everything that ran while enabled, slowest first, followed by the counters"""
+    lines: list[str] = []
+    ran: list[tuple[str, Statistic]] = sorted([(n, s) for n, s in statistics.items() if s.calls], key=lambda ns: -ns[1].elapsed)
+    if ran:
+        lines.append(f'{"name":<48} {"calls":>12} {"seconds":>10} {"us/call":>10}')
+        for name, record in ran:
+            lines.append(f'{name:<48} {record.calls:>12} {record.elapsed:>10.3f} {record.elapsed * 1e6 / record.calls:>10.1f}')
+    for name, value in sorted(counters.items()):
+        lines.append(f'{name:<48} {value:>12}')
+    result: str = '\n'.join(lines)
+    return result
+
+
+@contextmanager
+def profile(kind: str = CPROFILE, lines: int = REPORT_LINES) -> Iterator[io.StringIO]:
+    """Profile a block of code; the report is written to the yielded buffer when the block finishes
+
+    cprofile is deterministic (every call, with considerable overhead); sampling records where we are every
+    SAMPLE_INTERVAL seconds of CPU time, which barely slows the code down but is only statistically accurate (and only
+    works on the main thread of a Unix process).
+    """
+    output: io.StringIO = io.StringIO()
+    if kind == CPROFILE:
+        profiler: cProfile.Profile = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield output
+        finally:
+            profiler.disable()
+            pstats.Stats(profiler, stream=output).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(lines)
+    elif kind == SAMPLING:
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+
+        def sample(signal_number, frame) -> None:
+            own[describe(frame)] += 1
+            seen: set[str] = set()
+            while frame is not None:
+                where: str = describe(frame, line=False)
+                if where not in seen:
+                    seen.add(where)
+                    inclusive[where] += 1
+                frame = frame.f_back
+
+        previous = signal.signal(signal.SIGPROF, sample)
+        signal.setitimer(signal.ITIMER_PROF, SAMPLE_INTERVAL, SAMPLE_INTERVAL)
+        try:
+            yield output
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, previous)
+            total: int = sum(own.values()) or 1
+            output.write(f'{total} samples\n{"own %":>7}  where\n')
+            for where, samples in own.most_common(lines):
+                output.write(f'{samples * 100 / total:>7.1f}  {where}\n')
+            output.write(f'{"total %":>7}  function\n')
+            for where, samples in inclusive.most_common(lines):
+                output.write(f'{samples * 100 / total:>7.1f}  {where}\n')
+    else:
+        raise Exception(f'Unknown profiler {kind}; expected {CPROFILE} or {SAMPLING}')
+
+def describe(frame, line: bool = True) -> str:
+    code = frame.f_code
+    result: str = f'{os.path.basename(code.co_filename)}:{code.co_name}' + (f':{frame.f_lineno}' if line else '')
+    return result
+
+
+@traced
+def _fibonacci(n: int) -> int:
+    return n if n < 2 else _fibonacci(n - 1) + _fibonacci(n - 2)
+
+def test():
+    # disabled, the function is untouched and nothing is recorded
+    assert(_fibonacci.__name__ == '_fibonacci' and not hasattr(_fibonacci, '__wrapped__'))
+    _fibonacci(10)
+    count(name='ignored')
+    with span(name='ignored span'):
+        pass
+    assert(statistic(name=f'{__name__}._fibonacci').calls == 0)
+    assert(not counters)
+
+    enable()
+    try:
+        assert(_fibonacci(10) == 55)
+        count(name='additions', amount=3)
+        with span(name='outer'):
+            with span(name='outer'):
+                pass
+    finally:
+        disable()
+    record: Statistic = statistic(name=f'{__name__}._fibonacci')
+    # every recursive call is counted, but the time only once
+    assert(record.calls == 177)
+    assert(record.depth == 0 and record.elapsed > 0.0)
+    assert(counters['additions'] == 3)
+    assert(statistic(name='outer').calls == 2)
+    assert('_fibonacci' in report())
+    assert(not hasattr(_fibonacci, '__wrapped__'))
+    reset()
+    assert(statistic(name=f'{__name__}._fibonacci').calls == 0)
+
+    with profile(kind=CPROFILE) as output:
+        _fibonacci(15)
+    assert('_fibonacci' in output.getvalue())
+    return
+
+def main(argv: list[str]):
+    test()
+    return
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,245 @@
+import re
+import sys
+from array import array
+from itertools import accumulate, chain
+from time import perf_counter
+from typing import Iterable, Iterator, Pattern
+
+from common import parse_ints, stream_lines
+
+# {name:kind} or {name:kind(separator)} within a record template
+FIELD_PATTERN: Pattern = re.compile(r'\{(\w+):(\w+)(?:\((.*?)\))?\}')
+
+# regex for each kind of field
+INT_FIELD: str = 'int'
+WORD_FIELD: str = 'word'
+TEXT_FIELD: str = 'str'
+INTS_FIELD: str = 'ints'
+FIELD_REGEX: dict[str, str] = {
+    INT_FIELD: r'[-+]?\d+',
+    WORD_FIELD: r'\w+',
+    TEXT_FIELD: r'[^\n]*?',
+}
+
+
+class RaggedColumn:
+    """A column holding a list of ints per record; every value in one flat array, plus where each record's values start"""
+    def __init__(self, values: array, offsets: array) -> None:
+        self.values = values
+        # len(records) + 1 entries; record i holds values[offsets[i]:offsets[i + 1]]
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> array:
+        result: array = self.values[self.offsets[index]:self.offsets[index + 1]]
+        return result
+
+    def __iter__(self) -> Iterator[array]:
+        values: array = self.values
+        offsets: array = self.offsets
+        for i in range(len(offsets) - 1):
+            yield values[offsets[i]:offsets[i + 1]]
+
+
+class Records:
+    """Every record parsed from an input, column by column"""
+    def __init__(self, names: list[str], columns: list[array|list[str]|RaggedColumn], count: int) -> None:
+        self.names = names
+        self.columns = dict(zip(names, columns))
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, name: str) -> array|list[str]|RaggedColumn:
+        return self.columns[name]
+
+    def rows(self) -> Iterator[tuple]:
+        """The records again, one tuple (in field order) at a time"""
+        return zip(*[self.columns[name] for name in self.names])
+
+
+class RecordFormat:
+    """A declarative description of one kind of input record, compiled once into a single regex
+
+    The template is literal text with {name:kind} fields; kind is int, word (letters, digits, underscore), str
+    (anything up to the next literal) or ints(separator) for a separated list of ints. A space in the template
+    matches any amount of horizontal whitespace; that may be none at all beside other literal text, but a space that
+    is all that separates two fields needs at least one blank. A newline matches a line break, so a record may span
+    several lines. Each record must start and end on a line boundary (and may be indented or trail blanks).
+
+    The whole input is scanned in one go with findall(), and each column is then converted in bulk, so there is no
+    per-line Python work at all ... anything that does not match the template is skipped.
+    """
+    def __init__(self, template: str, flags: int = 0) -> None:
+        self.template = template
+        self.names: list[str] = []
+        self.kinds: list[str] = []
+        self.separators: list[str|None] = []
+        pieces: list[str] = []
+        position: int = 0
+        for match in FIELD_PATTERN.finditer(template):
+            # (only a literal between two fields can be separating them)
+            pieces.append(RecordFormat.literal(text=template[position:match.start()], separating=position > 0))
+            name, kind, separator = match.group(1), match.group(2), match.group(3)
+            if kind == INTS_FIELD:
+                separator = ' ' if separator is None or separator == '' else separator
+                # the separator may be padded with spaces either side (or be nothing but spaces)
+                gap: str = '[ \\t]*' + re.escape(separator.strip()) + '[ \\t]*' if separator.strip() else '[ \\t]+'
+                field_regex: str = f'{FIELD_REGEX[INT_FIELD]}(?:{gap}{FIELD_REGEX[INT_FIELD]})*'
+            elif kind in FIELD_REGEX:
+                field_regex = FIELD_REGEX[kind]
+            else:
+                raise Exception(f'Unknown field kind {kind} for field {name} in record template {template!r}')
+            pieces.append(f'({field_regex})')
+            self.names.append(name)
+            self.kinds.append(kind)
+            self.separators.append(separator)
+            position = match.end()
+        pieces.append(RecordFormat.literal(text=template[position:], separating=False))
+        self.pattern: Pattern = re.compile(r'^[ \t]*' + ''.join(pieces) + r'[ \t]*\r?$', re.MULTILINE | flags)
+        self.lines_per_record: int = template.count('\n') + 1
+
+    @staticmethod
+    def literal(text: str, separating: bool) -> str:
+        # spaces alone between two fields must match something, or '12' would pass for '{a:int} {b:int}'
+        if separating and text and not text.strip(' '):
+            return '[ \\t]+'
+        pieces: list[str] = []
+        for khar in text:
+            if khar == ' ':
+                pieces.append('[ \\t]*')
+            elif khar == '\n':
+                pieces.append('[ \\t]*\\r?\\n[ \\t]*')
+            else:
+                pieces.append(re.escape(khar))
+        result: str = ''.join(pieces)
+        return result
+
+    def parse_text(self, text: str, strict: bool = False) -> Records:
+        """Every record in the text; anything else is skipped ... or, when strict, is an error (blank lines aside)"""
+        matches: list = self.pattern.findall(text)
+        if strict:
+            filled: int = sum(1 for line in text.split('\n') if line.strip())
+            if filled != len(matches) * self.lines_per_record:
+                raise Exception(f'Only {len(matches) * self.lines_per_record} of {filled} lines match the record template {self.template!r}')
+        width: int = len(self.names)
+        if width > 1 and all(kind == INT_FIELD for kind in self.kinds):
+            # converting every field at once, then dealing the values out, beats building a column at a time
+            values: array = parse_ints(list(chain.from_iterable(matches)))
+            result: Records = Records(names=self.names, columns=[values[i::width] for i in range(width)], count=len(matches))
+            return result
+        # findall() gives plain strings (not 1-tuples) when there is only the one field
+        groups: list[tuple[str, ...]] = list(zip(*matches)) if len(self.names) > 1 else [tuple(matches)]
+        if not matches:
+            groups = [()] * len(self.names)
+        columns: list[array|list[str]|RaggedColumn] = []
+        for kind, separator, column in zip(self.kinds, self.separators, groups):
+            if kind == INT_FIELD:
+                columns.append(parse_ints(list(column)))
+            elif kind == INTS_FIELD:
+                columns.append(RecordFormat.ragged(column=column, separator=separator))
+            else:
+                columns.append(list(column))
+        result = Records(names=self.names, columns=columns, count=len(matches))
+        return result
+
+    @staticmethod
+    def ragged(column: Iterable[str], separator: str) -> RaggedColumn:
+        # turn every separator (and whatever whitespace surrounds it) into a single space, then split the lot at once
+        separator = separator.strip()
+        cleaned: list[str] = [' '.join(entry.replace(separator, ' ').split()) for entry in column] if separator else [' '.join(entry.split()) for entry in column]
+        counts: list[int] = [entry.count(' ') + 1 for entry in cleaned]
+        values: array = parse_ints(' '.join(cleaned).split()) if cleaned else array('q')
+        offsets: array = array('q', [0])
+        offsets.extend(accumulate(counts))
+        result: RaggedColumn = RaggedColumn(values=values, offsets=offsets)
+        return result
+
+    def parse_lines(self, lines: Iterable[str], strict: bool = False) -> Records:
+        result: Records = self.parse_text(text='\n'.join(lines), strict=strict)
+        return result
+
+    def parse_file(self, path: str, strict: bool = False) -> Records:
+        result: Records = self.parse_lines(lines=stream_lines(path=path, strip=False), strict=strict)
+        return result
+
+
+def test():
+    robots: RecordFormat = RecordFormat('p={x:int},{y:int} v={dx:int},{dy:int}')
+    records: Records = robots.parse_text('p=0,4 v=3,-3\np=6,3 v=-1,-3\nnonsense\n  p=10,3 v=-1,2  \n')
+    assert(len(records) == 3)
+    assert(list(records['x']) == [0, 6, 10])
+    assert(list(records['dy']) == [-3, -3, 2])
+    assert(list(records.rows())[1] == (6, 3, -1, -3))
+    # a malformed record in the middle is skipped, not taken for a record
+    records = robots.parse_text('p=0,4 v=3,-3\np=6,3,1 v=-1\np=10,3 v=-1,2')
+    assert(list(records.rows()) == [(0, 4, 3, -3), (10, 3, -1, 2)])
+    assert(list(RecordFormat('{before:int} | {after:int}').parse_text('5|6\n1 2\n7|8').rows()) == [(5, 6), (7, 8)])
+
+    # a record spread over several lines
+    machines: RecordFormat = RecordFormat('Button A: X+{ax:int}, Y+{ay:int}\nButton B: X+{bx:int}, Y+{by:int}\nPrize: X={x:int}, Y={y:int}')
+    records = machines.parse_text('Button A: X+94, Y+34\nButton B: X+22, Y+67\nPrize: X=8400, Y=5400\n\nButton A: X+26, Y+66\nButton B: X+67, Y+21\nPrize: X=12748, Y=12176\n')
+    assert(list(records.rows()) == [(94, 34, 22, 67, 8400, 5400), (26, 66, 67, 21, 12748, 12176)])
+
+    # ragged lists ... and two formats sharing one input
+    text: str = '47|53\n97 | 13\n\n75,47,61,53,29\n97, 61,53\n'
+    orders: Records = RecordFormat('{before:int} | {after:int}').parse_text(text)
+    assert(list(orders.rows()) == [(47, 53), (97, 13)])
+    pages: Records = RecordFormat('{pages:ints(,)}').parse_text(text)
+    assert(len(pages) == 2)
+    assert([list(p) for p in pages['pages']] == [[75, 47, 61, 53, 29], [97, 61, 53]])
+    equations: Records = RecordFormat('{target:int}: {operands:ints}').parse_text('190: 10 19\n3267: 81 40 27\n')
+    assert(list(equations['target']) == [190, 3267])
+    assert(list(equations['operands'][1]) == [81, 40, 27])
+
+    # a space that is all that separates two fields has to be there
+    pair: RecordFormat = RecordFormat('{a:int} {b:int}')
+    assert(list(pair.parse_text('1 2\n12\n').rows()) == [(1, 2)])
+    try:
+        pair.parse_text('12\n', strict=True)
+        assert(False)
+    except Exception as e:
+        assert('match the record template' in str(e))
+    assert(len(RecordFormat('{a:word} {b:word}').parse_text('hello')) == 0)
+    assert(list(RecordFormat('{a:word} {b:word}').parse_text(' hell \t o ').rows()) == [('hell', 'o')])
+
+    pairs: Records = RecordFormat('{left:word}-{right:word}').parse_lines(['kh-tc', 'qp-kh', ''])
+    assert(list(pairs.rows()) == [('kh', 'tc'), ('qp', 'kh')])
+    assert(len(RecordFormat('{left:word}-{right:word}').parse_text('')) == 0)
+    return
+
+def benchmark(count: int) -> None:
+    """Per-line regex matching (the way the day modules used to parse) against a compiled record format
+
+    There is little in it for speed (converting the ints is most of the cost either way); the point of a format is
+    that it is declared once.
+    """
+    text: str = ''.join(f'p={i % 101},{i % 103} v={i % 7 - 3},{i % 5 - 2}\n' for i in range(count))
+    line_pattern: Pattern = re.compile(r'^p=([+\-]?\d+),([+\-]?\d+)\s+v=([+\-]?\d+),([+\-]?\d+)\s*$', re.IGNORECASE)
+    start: float = perf_counter()
+    per_line: list[tuple[int, int, int, int]] = []
+    for line in text.split('\n'):
+        bits = line_pattern.match(line.strip())
+        if bits is None:
+            continue
+        per_line.append((int(bits[1]), int(bits[2]), int(bits[3]), int(bits[4])))
+    per_line_elapsed: float = perf_counter() - start
+    start = perf_counter()
+    records: Records = RecordFormat('p={x:int},{y:int} v={dx:int},{dy:int}').parse_text(text)
+    compiled_elapsed: float = perf_counter() - start
+    if list(records.rows()) != per_line:
+        raise Exception('The compiled record format disagrees with per-line parsing')
+    print(f'{count} records: per line {per_line_elapsed:.3f}s, compiled {compiled_elapsed:.3f}s ({per_line_elapsed / compiled_elapsed:.1f}x)')
+    return
+
+def main(argv: list[str]):
+    test()
+    if len(argv) > 1:
+        benchmark(count=int(argv[1]))
+    return
+
+if __name__ == '__main__':
+    main(sys.argv)
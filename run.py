@@ -0,0 +1,382 @@
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import multiprocessing
+import os
+import resource
+import sys
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from time import perf_counter, process_time
+from typing import Any
+
+import instrument
+import sink
+from cache import ResultCache, cache_key
+from common import read_lines_from_file
+
+# the directory holding the day modules (and their inputs)
+HOME: str = os.path.dirname(os.path.abspath(__file__))
+
+DAY_NUMBERS: dict[str, int] = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17,
+    'eighteen': 18, 'nineteen': 19, 'twenty': 20, 'twenty_one': 21, 'twenty_two': 22, 'twenty_three': 23,
+    'twenty_four': 24, 'twenty_five': 25,
+}
+PART_NAMES: tuple[str, ...] = ('one', 'two')
+TEST_INPUT: str = 'test'
+ACTUAL_INPUT: str = 'actual'
+
+
+@dataclass
+class Part:
+    """One part of one day: which function to call, and with what
+
+    Keyword argument and module setting values that name an attribute of the module (or are lists of such names)
+    are resolved to that attribute when the part is run.
+    """
+    module: str
+    name: str
+    function: str
+    arguments: dict[str, Any] = field(default_factory=dict)
+    # replacements for arguments when running against the test input
+    test_arguments: dict[str, Any] = field(default_factory=dict)
+    # module globals that must be set before the function is called
+    settings: dict[str, Any] = field(default_factory=dict)
+    # the answer the test input should give, where we know it
+    expected: Any = None
+    # the function reads its input from stdin (rather than being handed a path)
+    stdin: bool = False
+
+    @property
+    def day(self) -> int:
+        prefix: str = self.module[len('day_'):].split('_part_')[0]
+        return DAY_NUMBERS.get(prefix, 0)
+
+
+@dataclass
+class PartResult:
+    module: str
+    part: str
+    input: str
+    answer: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    # kilobytes
+    peak_rss: int = 0
+    error: str|None = None
+    expected: Any = None
+    # the answer came out of the result cache, rather than being worked out afresh
+    cached: bool = False
+    # what the instrumentation (or profiler) had to say, when asked
+    report: str|None = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return 'error'
+        if self.expected is not None and self.answer != self.expected:
+            return 'WRONG'
+        return 'cached' if self.cached else 'ok'
+
+
+# where a module's main() does something other than call part_one() / part_two() with a path, say so here
+PART_OVERRIDES: dict[str, dict[str, dict[str, Any]]] = {
+    'day_four': {'one': {'expected': 18}, 'two': {'expected': 9}},
+    'day_five': {'one': {'function': 'part_one_try_too', 'expected': 143}, 'two': {'expected': 123}},
+    'day_seven': {
+        'one': {'function': 'part_one', 'settings': {'OPERATORS': ['ADD', 'MULTIPLY']}, 'expected': 3749},
+        'two': {'function': 'part_one', 'settings': {'OPERATORS': ['ADD', 'MULTIPLY', 'CONCAT']}, 'expected': 11387},
+    },
+    'day_eight': {
+        'one': {'function': 'part_one', 'arguments': {'antinode_calculator': 'antinodes'}, 'expected': 14},
+        'two': {'function': 'part_one', 'arguments': {'antinode_calculator': 'resonant_antinodes'}, 'expected': 34},
+    },
+    'day_nine': {'two': {'expected': 2858}},
+    'day_ten': {'one': {'expected': 36}, 'two': {'expected': 81}},
+    'day_eleven': {
+        'one': {'function': 'p45', 'arguments': {'count': 25}, 'expected': 55312},
+        'two': {'function': 'p45', 'arguments': {'count': 75}},
+    },
+    'day_twelve': {'one': {'expected': 1930}, 'two': {'expected': 1206}},
+    'day_thirteen': {'two': {'expected': 875318608908}},
+    'day_fourteen': {
+        'one': {'arguments': {'grid_width': 101, 'grid_height': 103}, 'test_arguments': {'grid_width': 11, 'grid_height': 7}, 'expected': 12},
+        'two': {'arguments': {'grid_width': 101, 'grid_height': 103}, 'test_arguments': {'grid_width': 11, 'grid_height': 7}},
+    },
+    'day_twenty_three': {'one': {'expected': 7}, 'two': {'function': 'part_two_take_two', 'expected': 'co,de,ka,ta'}},
+}
+# not a paste error: day_sixteen.py is still a copy of day_fourteen.py (the same robots on the same grid), so it runs the same way
+PART_OVERRIDES['day_sixteen'] = PART_OVERRIDES['day_fourteen']
+
+
+def discover_parts(home: str = HOME) -> list[Part]:
+    """Every part of every day module, in day order
+
+    Modules named day_<n>_part_<p> are a single part that reads stdin; any other day_<n> module supplies part_one()
+    and part_two() (unless PART_OVERRIDES says otherwise). Modules are only imported when a part is run, so a module
+    that does not even compile does not stop the rest.
+    """
+    result: list[Part] = []
+    for filename in sorted(os.listdir(home)):
+        if not (filename.startswith('day_') and filename.endswith('.py')):
+            continue
+        module: str = filename[:-len('.py')]
+        if '_part_' in module:
+            result.append(Part(module=module, name=module.split('_part_')[1], function='main', stdin=True))
+            continue
+        overrides: dict[str, dict[str, Any]] = PART_OVERRIDES.get(module, {})
+        for name in PART_NAMES:
+            details: dict[str, Any] = {'function': f'part_{name}'} | overrides.get(name, {})
+            result.append(Part(module=module, name=name, **details))
+    result.sort(key=lambda p: (p.day, p.module, p.name))
+    return result
+
+def select_parts(parts: list[Part], days: list[str], part_names: list[str]) -> list[Part]:
+    """Parts of the requested days (module name, spelt out number, or digits; all days when none are given)"""
+    def wanted(part: Part) -> bool:
+        if part_names and part.name not in part_names:
+            return False
+        if not days:
+            return True
+        prefix: str = part.module[len('day_'):].split('_part_')[0]
+        return any(d in (part.module, prefix, str(part.day)) for d in days)
+    result: list[Part] = [p for p in parts if wanted(p)]
+    return result
+
+def input_path(part: Part, selection: str, home: str = HOME) -> str|None:
+    """Path of the input to run the part against; test or actual input by naming convention, or a path of our own"""
+    if selection not in (TEST_INPUT, ACTUAL_INPUT):
+        return selection
+    prefix: str = part.module.split('_part_')[0]
+    candidates: list[str] = [f'{prefix}_test_input.txt'] if selection == TEST_INPUT else [f'{prefix}_input.txt', f'{prefix}_actual_input.txt']
+    for candidate in candidates:
+        path: str = os.path.join(home, candidate)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def resolve(module: Any, value: Any) -> Any:
+    if isinstance(value, str) and hasattr(module, value):
+        return getattr(module, value)
+    if isinstance(value, list):
+        return [resolve(module=module, value=v) for v in value]
+    return value
+
+def part_key(part: Part, path: str, selection: str) -> str:
+    """Result cache key for running a part against the input at path"""
+    arguments: dict[str, Any] = part.arguments | (part.test_arguments if selection == TEST_INPUT else {})
+    parameters: dict[str, Any] = {'arguments': sorted(arguments.items()), 'settings': sorted(part.settings.items()), 'stdin': part.stdin}
+    result: str = cache_key(module=part.module, function=part.function, input_path=path, parameters=parameters, home=HOME)
+    return result
+
+def call_part(part: Part, path: str, selection: str) -> Any:
+    """Import the module and run the part against the input at path; returns the answer"""
+    if HOME not in sys.path:
+        sys.path.insert(0, HOME)
+    module = importlib.import_module(part.module)
+    for name, value in part.settings.items():
+        setattr(module, name, resolve(module=module, value=value))
+    function = getattr(module, part.function)
+    if part.stdin:
+        with open(path, 'r') as file, contextlib.redirect_stdout(io.StringIO()) as output:
+            saved_stdin = sys.stdin
+            sys.stdin = file
+            try:
+                function([part.module])
+            finally:
+                sys.stdin = saved_stdin
+        # these print their answer rather than return it ... so the answer is the last thing printed
+        lines: list[str] = output.getvalue().strip().split('\n')
+        return lines[-1] if lines else None
+    arguments: dict[str, Any] = part.arguments | (part.test_arguments if selection == TEST_INPUT else {})
+    arguments = {name: resolve(module=module, value=value) for name, value in arguments.items()}
+    parameters = inspect.signature(function).parameters
+    if 'data_lines' in parameters:
+        arguments['data_lines'] = read_lines_from_file(path=path)
+    else:
+        arguments['path'] = path
+    return function(**arguments)
+
+def run_part(part: Part, selection: str, verbose: bool = False, instrumented: bool = False, profiler: str|None = None,
+             log_level: str|None = None) -> PartResult:
+    """Run one part in this process, timing it; anything the part prints (or logs) is swallowed unless verbose
+
+    When instrumented, the calls and time of every traced function are reported; profiler (cprofile or sampling)
+    profiles the whole part. Either way the report comes back with the result.
+    """
+    path: str|None = input_path(part=part, selection=selection)
+    result: PartResult = PartResult(module=part.module, part=part.name, input=os.path.basename(path) if path else selection,
+                                    expected=part.expected if selection == TEST_INPUT else None)
+    if path is None:
+        result.error = f'no {selection} input'
+        return result
+    if log_level is not None:
+        sink.set_level(log_level)
+    if instrumented:
+        instrument.reset()
+        instrument.enable()
+    profiling = instrument.profile(kind=profiler) if profiler else contextlib.nullcontext(None)
+    profile_output: io.StringIO|None = None
+    start_wall: float = perf_counter()
+    start_cpu: float = process_time()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()), profiling as profile_output:
+            try:
+                result.answer = call_part(part=part, path=path, selection=selection)
+            finally:
+                sink.flush()
+    except BaseException as e:
+        result.error = f'{type(e).__name__}: {e}'
+        if verbose:
+            traceback.print_exc()
+    result.wall = perf_counter() - start_wall
+    result.cpu = process_time() - start_cpu
+    if instrumented:
+        instrument.disable()
+        result.report = instrument.report()
+    if profile_output is not None:
+        result.report = '\n'.join(r for r in [result.report, profile_output.getvalue()] if r)
+    result.peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+def _child(connection, part: Part, selection: str, options: dict[str, Any]) -> None:
+    connection.send(run_part(part=part, selection=selection, **options))
+    connection.close()
+
+def run_isolated(part: Part, selection: str, timeout: float|None = None, **options) -> PartResult:
+    """Run one part in a child process of its own, so that its peak RSS (and any module globals it sets) are its own
+
+    A part still running after timeout seconds is killed, and reported as an error. Any other options are handed
+    on to run_part().
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(sender, part, selection, options))
+    process.start()
+    sender.close()
+    result: PartResult
+    try:
+        if receiver.poll(timeout):
+            result = receiver.recv()
+        else:
+            process.kill()
+            result = PartResult(module=part.module, part=part.name, input=selection, wall=timeout, error=f'timed out after {timeout}s')
+    except EOFError:
+        result = PartResult(module=part.module, part=part.name, input=selection, error='child process died')
+    process.join()
+    return result
+
+def run_parallel(jobs: list[tuple[Part, str]], workers: int|None = None, **options) -> list[PartResult]:
+    """Run independent (part, input) jobs across a pool of worker processes; the results come back in job order
+
+    Every worker runs a single job and is then replaced, so each job starts with fresh module globals and reports its
+    own peak RSS, just as run_isolated() would. Workers are started with forkserver (fork cannot be combined with
+    replacing workers), so every job imports its module afresh. workers defaults to the number of CPUs.
+    """
+    context = multiprocessing.get_context('forkserver')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as executor:
+        futures: list[Future] = [executor.submit(run_part, part=part, selection=selection, **options) for part, selection in jobs]
+        results: list[PartResult] = []
+        for (part, selection), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                results.append(PartResult(module=part.module, part=part.name, input=selection, error='worker process died'))
+    return results
+
+def run_cached(jobs: list[tuple[Part, str]], cache: ResultCache, run, refresh: bool = False) -> list[PartResult]:
+    """Answer what we can from the cache, run(jobs) for the rest, and remember whatever they work out
+
+    Only answers that came back without error are remembered. With refresh, every job is run and the cache is
+    merely brought up to date.
+    """
+    results: list[PartResult|None] = [None] * len(jobs)
+    keys: list[str|None] = [None] * len(jobs)
+    missing: list[int] = []
+    for i, (part, selection) in enumerate(jobs):
+        path: str|None = input_path(part=part, selection=selection)
+        if path is not None and os.path.isfile(path):
+            keys[i] = part_key(part=part, path=path, selection=selection)
+            entry: dict[str, Any]|None = None if refresh else cache.get(key=keys[i])
+            if entry is not None:
+                results[i] = PartResult(module=part.module, part=part.name, input=os.path.basename(path), answer=entry['answer'],
+                                        expected=part.expected if selection == TEST_INPUT else None, cached=True)
+                continue
+        missing.append(i)
+    for i, result in zip(missing, run([jobs[i] for i in missing])):
+        results[i] = result
+        if keys[i] is not None and result.error is None:
+            cache.put(key=keys[i], entry={'answer': result.answer, 'wall': result.wall, 'cpu': result.cpu})
+    return results
+
+def format_results(results: list[PartResult]) -> str:
+    lines: list[str] = [f'{"module":<20} {"part":<5} {"input":<28} {"wall s":>9} {"cpu s":>9} {"peak MB":>8} {"status":<6} answer']
+    for r in results:
+        answer: str = r.error if r.error is not None else str(r.answer)
+        if r.status == 'WRONG':
+            answer += f' (expected {r.expected})'
+        lines.append(f'{r.module:<20} {r.part:<5} {r.input:<28} {r.wall:>9.3f} {r.cpu:>9.3f} {r.peak_rss / 1024:>8.1f} {r.status:<6} {answer}')
+    result: str = '\n'.join(lines)
+    return result
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Run the day modules, timing each part')
+    parser.add_argument('days', nargs='*', help='days to run (day_seven, seven or 7); all of them when omitted')
+    parser.add_argument('--part', action='append', choices=PART_NAMES, help='only run this part (may be repeated)')
+    parser.add_argument('--input', action='append', help='test, actual, or the path of an input file (may be repeated; default test)')
+    parser.add_argument('--jobs', type=int, default=1, help='number of parts to run at once (0 for one per CPU)')
+    parser.add_argument('--in-process', action='store_true', help='run every part in this process (peak RSS is then cumulative)')
+    parser.add_argument('--verbose', action='store_true', help='let the parts print as they go')
+    parser.add_argument('--log-level', choices=tuple(sink.LEVELS), help='show diagnostics at this level and above (with --verbose)')
+    parser.add_argument('--instrument', action='store_true', help='report the calls and time of every traced function')
+    parser.add_argument('--profile', choices=(instrument.CPROFILE, instrument.SAMPLING), help='profile each part')
+    parser.add_argument('--no-cache', action='store_true', help='neither look in nor add to the result cache')
+    parser.add_argument('--refresh', action='store_true', help='work every answer out afresh, updating the result cache')
+    parser.add_argument('--clear-cache', action='store_true', help='empty the result cache first')
+    parser.add_argument('--list', action='store_true', help='list the parts that would be run, and stop')
+    return parser
+
+def main(argv: list[str]) -> int:
+    arguments = build_parser().parse_args(argv[1:])
+    parts: list[Part] = select_parts(parts=discover_parts(), days=arguments.days, part_names=arguments.part or [])
+    if arguments.list:
+        for part in parts:
+            print(f'{part.module:<20} {part.name:<5} {part.function}')
+        return 0
+    jobs: list[tuple[Part, str]] = [(part, selection) for selection in arguments.input or [TEST_INPUT] for part in parts]
+    start: float = perf_counter()
+
+    options: dict[str, Any] = {'verbose': arguments.verbose, 'instrumented': arguments.instrument, 'profiler': arguments.profile,
+                               'log_level': arguments.log_level}
+
+    def run(pending: list[tuple[Part, str]]) -> list[PartResult]:
+        if not pending:
+            return []
+        if arguments.jobs != 1 and not arguments.in_process:
+            return run_parallel(jobs=pending, workers=arguments.jobs or None, **options)
+        runner = run_part if arguments.in_process else run_isolated
+        return [runner(part=part, selection=selection, **options) for part, selection in pending]
+
+    cache: ResultCache = ResultCache()
+    if arguments.clear_cache:
+        cache.clear()
+    # an instrumented or profiled run is only worth anything if the parts really run
+    refresh: bool = arguments.refresh or arguments.instrument or arguments.profile is not None
+    results: list[PartResult] = run(jobs) if arguments.no_cache else run_cached(jobs=jobs, cache=cache, run=run, refresh=refresh)
+    print(format_results(results=results))
+    for r in results:
+        if r.report:
+            print(f'\n{r.module} part {r.part} ({r.input})\n{r.report}')
+    print(f'{len(jobs)} parts in {perf_counter() - start:.3f}s')
+    result: int = 1 if any(r.status == 'WRONG' for r in results) else 0
+    return result
+
+if __name__ == '__main__':
+    exit_code: int = main(sys.argv)
+    sys.exit(exit_code)
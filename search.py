@@ -0,0 +1,262 @@
+import heapq
+import sys
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from common import Position, EAST
+from grid import Grid, SENTINEL
+
+# distance recorded against cells (or states) the search never reached
+UNREACHED: int = -1
+
+# (from index, to index, direction of travel) -> cost of the step, or None if the step cannot be taken
+StepCost = Callable[[int, int, int], int|None]
+# (flat index) -> lower bound upon the remaining cost to the goal
+Heuristic = Callable[[int], int]
+
+
+@dataclass
+class SearchResult:
+    # total cost of the cheapest path, or None if the goal cannot be reached
+    cost: int|None
+    path: list[Position]
+    # cheapest known cost to each state searched, UNREACHED elsewhere ... one state per cell, or per cell and
+    # heading (index * headings + heading) when turns are being costed.
+    distances: array = field(repr=False)
+    headings: int = 1
+
+
+def manhattan(grid: Grid, goal: Position|tuple[int, int], step_cost: int = 1) -> Heuristic:
+    """Admissible A* heuristic for 4-connected moves; the row and column distance to the goal"""
+    goal_position: Position = Position.as_position(candidate=goal)
+    offset: int = grid.offset
+    stride: int = grid.stride
+
+    def heuristic(index: int) -> int:
+        row, column = divmod(index - offset, stride)
+        return (abs(row - goal_position.row) + abs(column - goal_position.column)) * step_cost
+    return heuristic
+
+def turns(from_direction: int, to_direction: int) -> int:
+    """Number of eighth turns between two directions (a quarter turn is two)"""
+    difference: int = abs(from_direction - to_direction) % 8
+    result: int = min(difference, 8 - difference)
+    return result
+
+def shortest_path(grid: Grid, start: Position|tuple[int, int], goal: Position|tuple[int, int], walls: str = '#', step_cost: int = 1,
+                  turn_cost: int = 0, start_direction: int|None = None, cost: StepCost|None = None, heuristic: Heuristic|None = None,
+                  diagonal: bool = False) -> SearchResult:
+    """Dijkstra (or A*, when given a heuristic) from start to goal
+
+    Steps into any cell holding one of walls are forbidden, every other step costs step_cost ... unless a cost
+    function is supplied, in which case it has the final say on every step. Each quarter turn costs turn_cost (the
+    reindeer maze charges 1000); once turns are costed the search runs over (cell, heading) states, and start_direction
+    is the heading we begin with (any heading, when None).
+    """
+    start_index: int = grid.index_of(position=start)
+    goal_index: int = grid.index_of(position=goal)
+    blocked: set[int] = set(walls.encode('latin-1'))
+    cells = grid.cells
+
+    # when turns cost nothing, the heading is irrelevant and there is a single state per cell
+    directed: bool = turn_cost != 0 or start_direction is not None
+    headings: int = (8 if diagonal else 4) if directed else 1
+    # directions are numbered 0..7 clockwise; without diagonals only the even ones are used.
+    heading_shift: int = 0 if diagonal else 1
+
+    size: int = grid.index_space() * headings
+    distances: array = array('q', [UNREACHED]) * size
+    previous: array = array('q', [UNREACHED]) * size
+    settled: bytearray = bytearray(size)
+
+    queue: list[tuple[int, int, int]] = []
+    if directed:
+        start_headings: list[int] = [start_direction >> heading_shift] if start_direction is not None else list(range(headings))
+        for heading in start_headings:
+            state: int = start_index * headings + heading
+            distances[state] = 0
+            queue.append((heuristic(start_index) if heuristic else 0, 0, state))
+    else:
+        distances[start_index] = 0
+        queue.append((heuristic(start_index) if heuristic else 0, 0, start_index))
+
+    # the turn charged for each (heading, direction of travel), worked out once rather than per step
+    turn_costs: list[list[int]] = [[(turns(from_direction=h << heading_shift, to_direction=d) * turn_cost) >> 1 for d in range(8)] for h in range(headings)]
+    moves: tuple[tuple[int, int], ...] = grid.neighbour_offsets(diagonal=diagonal)
+    padded: bool = grid.padded
+    if padded:
+        # the border is as impassable as any wall
+        blocked.add(SENTINEL)
+
+    result: SearchResult = SearchResult(cost=None, path=[], distances=distances, headings=headings)
+    goal_state: int|None = None
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+    while queue:
+        priority, so_far, state = heappop(queue)
+        if settled[state]:
+            continue
+        settled[state] = 1
+        index: int = state // headings
+        if index == goal_index:
+            goal_state = state
+            break
+        if padded:
+            candidates = [(direction, index + delta) for direction, delta in moves if cells[index + delta] != SENTINEL]
+        else:
+            candidates = grid.neighbour_indices(index=index, diagonal=diagonal)
+        charges: list[int] = turn_costs[state % headings]
+        for direction, neighbour in candidates:
+            if cost is not None:
+                step: int|None = cost(index, neighbour, direction)
+                if step is None:
+                    continue
+            else:
+                if cells[neighbour] in blocked:
+                    continue
+                step = step_cost
+            if directed:
+                step += charges[direction]
+                next_state: int = neighbour * headings + (direction >> heading_shift)
+            else:
+                next_state = neighbour
+            if settled[next_state]:
+                continue
+            total: int = so_far + step
+            known: int = distances[next_state]
+            if known == UNREACHED or total < known:
+                distances[next_state] = total
+                previous[next_state] = state
+                heappush(queue, (total + heuristic(neighbour) if heuristic else total, total, next_state))
+
+    if goal_state is None:
+        return result
+
+    result.cost = distances[goal_state]
+    # walk the predecessors back to the start
+    path: list[Position] = []
+    state = goal_state
+    while state != UNREACHED:
+        index = state // headings
+        if not path or path[-1] != grid.position_of(index=index):
+            path.append(grid.position_of(index=index))
+        state = previous[state]
+    path.reverse()
+    result.path = path
+    return result
+
+def breadth_first(grid: Grid, start: Position|tuple[int, int], can_step: Callable[[int, int], bool]|None = None, walls: str = '#',
+                  diagonal: bool = False) -> array:
+    """Number of steps from start to every reachable cell (UNREACHED elsewhere), indexed by flat index
+
+    can_step(from value, to value) decides whether a step may be taken (values being the raw cell bytes); by default
+    any step that does not walk into walls is allowed. Flood filling a region is simply
+    can_step=lambda a, b: a == b ... a trail that must climb by one each step is can_step=lambda a, b: b == a + 1.
+    """
+    start_index: int = grid.index_of(position=start)
+    blocked: set[int] = set(walls.encode('latin-1'))
+    cells = grid.cells
+    result: array = array('q', [UNREACHED]) * grid.index_space()
+    result[start_index] = 0
+    queue: deque[int] = deque([start_index])
+    while queue:
+        index: int = queue.popleft()
+        steps: int = result[index] + 1
+        here: int = cells[index]
+        for direction, neighbour in grid.neighbour_indices(index=index, diagonal=diagonal):
+            if result[neighbour] != UNREACHED:
+                continue
+            there: int = cells[neighbour]
+            if can_step is None:
+                if there in blocked:
+                    continue
+            elif not can_step(here, there):
+                continue
+            result[neighbour] = steps
+            queue.append(neighbour)
+    return result
+
+def reached(grid: Grid, distances: array) -> list[Position]:
+    """Positions of every cell a breadth_first() search reached, in row then column order"""
+    result: list[Position] = [grid.position_of(index=i) for i, d in enumerate(distances) if d != UNREACHED]
+    return result
+
+
+def test():
+    # the two sample reindeer mazes; stepping forward costs 1, every quarter turn 1000, and we start facing east.
+    maze_alpha: list[str] = [
+        '###############',
+        '#.......#....E#',
+        '#.#.###.#.###.#',
+        '#.....#.#...#.#',
+        '#.###.#####.#.#',
+        '#.#.#.......#.#',
+        '#.#.#####.###.#',
+        '#...........#.#',
+        '###.#.#####.#.#',
+        '#...#.....#.#.#',
+        '#.#.#.###.#.#.#',
+        '#.....#...#.#.#',
+        '#.###.#.#.#.#.#',
+        '#S..#.....#...#',
+        '###############']
+    grid: Grid = Grid.from_lines(lines=maze_alpha)
+    start: Position = grid.find_value(value='S')[0]
+    goal: Position = grid.find_value(value='E')[0]
+    solution: SearchResult = shortest_path(grid=grid, start=start, goal=goal, turn_cost=1000, start_direction=EAST)
+    assert(solution.cost == 7036)
+    assert(solution.path[0] == start)
+    assert(solution.path[-1] == goal)
+    # and A* must agree
+    solution = shortest_path(grid=grid, start=start, goal=goal, turn_cost=1000, start_direction=EAST, heuristic=manhattan(grid=grid, goal=goal))
+    assert(solution.cost == 7036)
+
+    maze_beta: list[str] = [
+        '#################',
+        '#...#...#...#..E#',
+        '#.#.#.#.#.#.#.#.#',
+        '#.#.#.#...#...#.#',
+        '#.#.#.#.###.#.#.#',
+        '#...#.#.#.....#.#',
+        '#.#.#.#.#.#####.#',
+        '#.#...#.#.#.....#',
+        '#.#.#####.#.###.#',
+        '#.#.#.......#...#',
+        '#.#.###.#####.###',
+        '#.#.#...#.....#.#',
+        '#.#.#.#####.###.#',
+        '#.#.#.........#.#',
+        '#.#.#.#########.#',
+        '#S#.............#',
+        '#################']
+    grid = Grid.from_lines(lines=maze_beta)
+    solution = shortest_path(grid=grid, start=grid.find_value(value='S')[0], goal=grid.find_value(value='E')[0], turn_cost=1000, start_direction=EAST)
+    assert(solution.cost == 11048)
+
+    # plain shortest path in steps ... and the same again by breadth first search
+    solution = shortest_path(grid=grid, start=grid.find_value(value='S')[0], goal=grid.find_value(value='E')[0])
+    distances: array = breadth_first(grid=grid, start=grid.find_value(value='S')[0])
+    assert(solution.cost == distances[grid.index_of(position=grid.find_value(value='E')[0])])
+    assert(len(solution.path) == solution.cost + 1)
+
+    # no way through
+    grid = Grid.from_lines(lines=['S#.', '.#E'])
+    solution = shortest_path(grid=grid, start=(0, 0), goal=(1, 2))
+    assert(solution.cost is None)
+    assert(solution.path == [])
+
+    # flood fill a region of identical cells
+    grid = Grid.from_lines(lines=['AAB', 'ABB', 'AAA'])
+    region: list[Position] = reached(grid=grid, distances=breadth_first(grid=grid, start=(0, 2), can_step=lambda a, b: a == b))
+    assert(region == [Position(0, 2), Position(1, 1), Position(1, 2)])
+    return
+
+
+def main(argv: list[str]):
+    test()
+    return
+
+if __name__ == '__main__':
+    main(sys.argv)
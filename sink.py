@@ -0,0 +1,105 @@
+import atexit
+import sys
+from typing import Callable, TextIO
+
+# levels, as the logging module numbers them
+DEBUG: int = 10
+INFO: int = 20
+WARNING: int = 30
+ERROR: int = 40
+LEVELS: dict[str, int] = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+# lines held back before they are written out in one go
+BUFFER_LINES: int = 8192
+
+# messages below this level are dropped ... by default, everything bar warnings and errors
+threshold: int = WARNING
+buffer: list[str] = []
+
+# a message, or something that makes one; pass a callable (lambda: f'...') from hot loops, so that a message
+# nobody is going to see is never even formatted.
+Message = str|Callable[[], str]
+
+
+def set_level(level: int|str) -> None:
+    global threshold
+    threshold = LEVELS[level.lower()] if isinstance(level, str) else level
+
+def enabled_for(level: int) -> bool:
+    return level >= threshold
+
+def emit(level: int, message: Message, end: str = '\n') -> None:
+    """Buffer a message (if it is at or above the threshold), writing the buffer out once it fills"""
+    if level < threshold:
+        return
+    buffer.append((message() if callable(message) else message) + end)
+    if len(buffer) >= BUFFER_LINES:
+        flush()
+
+def debug(message: Message, end: str = '\n') -> None:
+    if DEBUG < threshold:
+        return
+    emit(level=DEBUG, message=message, end=end)
+
+def info(message: Message, end: str = '\n') -> None:
+    if INFO < threshold:
+        return
+    emit(level=INFO, message=message, end=end)
+
+def warning(message: Message, end: str = '\n') -> None:
+    emit(level=WARNING, message=message, end=end)
+
+def error(message: Message, end: str = '\n') -> None:
+    emit(level=ERROR, message=message, end=end)
+
+def flush(stream: TextIO|None = None) -> None:
+    """Write out everything buffered so far (to stdout, as it is at the time, unless told otherwise)"""
+    if not buffer:
+        return
+    text: str = ''.join(buffer)
+    buffer.clear()
+    stream = sys.stdout if stream is None else stream
+    stream.write(text)
+    stream.flush()
+
+# nothing buffered is lost when the program finishes
+atexit.register(flush)
+
+
+def test():
+    import io
+    saved: int = threshold
+    try:
+        formatted: list[int] = []
+
+        def expensive() -> str:
+            formatted.append(1)
+            return 'expensive'
+
+        set_level(WARNING)
+        debug(expensive)
+        info('ignored')
+        warning('kept')
+        assert(not formatted)
+        assert(buffer == ['kept\n'])
+
+        set_level('debug')
+        assert(enabled_for(DEBUG))
+        debug(expensive)
+        debug('a', end='')
+        debug('b')
+        assert(formatted == [1])
+        output: io.StringIO = io.StringIO()
+        flush(stream=output)
+        assert(output.getvalue() == 'kept\nexpensive\nab\n')
+        assert(not buffer)
+    finally:
+        buffer.clear()
+        set_level(saved)
+    return
+
+def main(argv: list[str]):
+    test()
+    return
+
+if __name__ == '__main__':
+    main(sys.argv)